@@ -7,6 +7,10 @@ class UserPhoneNumberInline(admin.TabularInline):
     model = UserPhoneNumber
     extra = 1
     fields = ['phone_number', 'is_primary', 'is_verified', 'label']
+    
+    def get_queryset(self, request):
+        """Optimize queryset with select_related"""
+        return super().get_queryset(request).select_related('user')
 
 
 @admin.register(CustomUser)
@@ -16,6 +20,7 @@ class CustomUserAdmin(UserAdmin):
     list_filter = ['is_subscription_active', 'current_plan', 'is_active', 'is_staff', 'date_joined']
     search_fields = ['username', 'email', 'phone_number', 'first_name', 'last_name']
     ordering = ['-date_joined']
+    list_select_related = ('current_plan',)
     
     fieldsets = UserAdmin.fieldsets + (
         ('Profile Information', {
@@ -33,6 +38,17 @@ class CustomUserAdmin(UserAdmin):
     )
     
     inlines = [UserPhoneNumberInline]
+    
+    def get_queryset(self, request):
+        """Load only the listed columns on the changelist"""
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name == 'accounts_customuser_changelist':
+            queryset = queryset.only(
+                'username', 'email', 'phone_number', 'current_plan',
+                'is_subscription_active', 'is_active', 'date_joined'
+            )
+        return queryset
 
 
 @admin.register(UserPhoneNumber)
@@ -41,6 +57,7 @@ class UserPhoneNumberAdmin(admin.ModelAdmin):
     list_filter = ['is_primary', 'is_verified', 'label', 'created_at']
     search_fields = ['user__username', 'user__email', 'phone_number']
     ordering = ['-created_at']
+    list_select_related = ('user',)
     
     fieldsets = (
         ('Phone Number Information', {
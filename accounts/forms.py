@@ -1,27 +1,40 @@
 from django import forms
+from django.core.exceptions import NON_FIELD_ERRORS
 from django.contrib.auth.forms import UserCreationForm, UserChangeForm
-from django.core.validators import RegexValidator
-from .models import CustomUser, UserPhoneNumber
+from django.db import transaction
+from .models import CustomUser, UserPhoneNumber, PHONE_VALIDATOR
+from functools import lru_cache
+import re
+
+
+@lru_cache(maxsize=None)
+def _compiled(pattern):
+    """Compile a regex pattern once per process"""
+    return re.compile(pattern)
+
+
+# Shared Tailwind classes for form widgets. Widgets are deep-copied per
+# field, so a single instance can be reused across several fields.
+SIGNUP_INPUT_CLASS = 'mt-1 block w-full px-4 py-2 rounded-lg text-gray-900 focus:outline-none'
+PROFILE_INPUT_CLASS = 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-green-500 focus:border-green-500 text-sm'
+PROFILE_TEXT_INPUT = forms.TextInput(attrs={'class': PROFILE_INPUT_CLASS})
 
 
 class CustomUserCreationForm(UserCreationForm):
     """Form for creating new users"""
     
-    phone_regex = RegexValidator(
-        regex=r'^\+?1?\d{9,15}$',
-        message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
-    )
+    phone_regex = PHONE_VALIDATOR
     
     phone_number = forms.CharField(
         validators=[phone_regex],
         max_length=17,
         required=False,
         help_text="Primary phone number for contact",
-        widget=forms.TextInput(attrs={'class': 'mt-1 block w-full px-4 py-2 rounded-lg text-gray-900 focus:outline-none', 'placeholder': '+1234567890'})
+        widget=forms.TextInput(attrs={'class': SIGNUP_INPUT_CLASS, 'placeholder': '+1234567890'})
     )
     date_of_birth = forms.DateField(
         required=False,
-        widget=forms.DateInput(attrs={'type': 'date', 'class': 'mt-1 block w-full px-4 py-2 rounded-lg text-gray-900 focus:outline-none'})
+        widget=forms.DateInput(attrs={'type': 'date', 'class': SIGNUP_INPUT_CLASS})
     )
     
     def __init__(self, *args, **kwargs):
@@ -29,7 +42,7 @@ class CustomUserCreationForm(UserCreationForm):
         # Add CSS classes to all form fields to match login form exactly
         for field_name, field in self.fields.items():
             if field_name not in ['phone_number', 'date_of_birth']:  # Skip fields we already styled
-                field.widget.attrs.update({'class': 'mt-1 block w-full px-4 py-2 rounded-lg text-gray-900 focus:outline-none'})
+                field.widget.attrs.update({'class': SIGNUP_INPUT_CLASS})
             
             # Add placeholders
             if field_name == 'first_name':
@@ -68,20 +81,22 @@ class CustomUserCreationForm(UserCreationForm):
     
     def save(self, commit=True):
         user = super().save(commit=False)
-        user.phone_number = self.cleaned_data.get('phone_number')
+        user.phone_number = self.cleaned_data.get('phone_number') or ''
         user.date_of_birth = self.cleaned_data.get('date_of_birth')
         
         if commit:
-            user.save()
-            # Create primary phone number if provided
-            if user.phone_number:
-                UserPhoneNumber.objects.create(
-                    user=user,
-                    phone_number=user.phone_number,
-                    is_primary=True,
-                    is_verified=False,
-                    label='Primary'
-                )
+            # Commit the user and its primary phone number together
+            with transaction.atomic():
+                user.save()
+                # Create primary phone number if provided
+                if user.phone_number:
+                    UserPhoneNumber.objects.create(
+                        user=user,
+                        phone_number=user.phone_number,
+                        is_primary=True,
+                        is_verified=False,
+                        label='Primary'
+                    )
         return user
 
 
@@ -100,13 +115,12 @@ class CustomUserProfileForm(forms.ModelForm):
         model = CustomUser
         fields = ['first_name', 'last_name', 'username', 'email', 'phone_number', 'date_of_birth', 'profile_picture']
         widgets = {
-            'date_of_birth': forms.DateInput(attrs={'type': 'date'}),
-            'first_name': forms.TextInput(attrs={'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-green-500 focus:border-green-500 text-sm'}),
-            'last_name': forms.TextInput(attrs={'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-green-500 focus:border-green-500 text-sm'}),
-            'username': forms.TextInput(attrs={'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-green-500 focus:border-green-500 text-sm'}),
-            'email': forms.EmailInput(attrs={'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-green-500 focus:border-green-500 text-sm'}),
-            'phone_number': forms.TextInput(attrs={'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-green-500 focus:border-green-500 text-sm'}),
-            'date_of_birth': forms.DateInput(attrs={'type': 'date', 'class': 'mt-1 block w-full px-3 py-2 border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-green-500 focus:border-green-500 text-sm'}),
+            'first_name': PROFILE_TEXT_INPUT,
+            'last_name': PROFILE_TEXT_INPUT,
+            'username': PROFILE_TEXT_INPUT,
+            'email': forms.EmailInput(attrs={'class': PROFILE_INPUT_CLASS}),
+            'phone_number': PROFILE_TEXT_INPUT,
+            'date_of_birth': forms.DateInput(attrs={'type': 'date', 'class': PROFILE_INPUT_CLASS}),
             'profile_picture': forms.ClearableFileInput(attrs={'class': 'hidden', 'accept': 'image/*'}),
         }
 
@@ -121,6 +135,11 @@ class UserPhoneNumberForm(forms.ModelForm):
             'phone_number': forms.TextInput(attrs={'placeholder': '+1234567890'}),
             'label': forms.TextInput(attrs={'placeholder': 'e.g., Work, Home, Mobile'}),
         }
+        error_messages = {
+            NON_FIELD_ERRORS: {
+                'unique_together': "This phone number is already registered for your account.",
+            }
+        }
     
     def __init__(self, *args, **kwargs):
         self.user = kwargs.pop('user', None)
@@ -128,27 +147,25 @@ class UserPhoneNumberForm(forms.ModelForm):
         
         if self.user:
             # Don't allow changing primary status if this is the only phone number
-            existing_numbers = UserPhoneNumber.objects.filter(user=self.user)
-            if existing_numbers.count() <= 1:
+            other_numbers = UserPhoneNumber.objects.filter(user=self.user).exclude(
+                pk=getattr(self.instance, 'pk', None)
+            )
+            if not other_numbers.exists():
                 self.fields['is_primary'].widget.attrs['disabled'] = True
                 self.fields['is_primary'].help_text = "Cannot remove primary status from the only phone number"
     
-    def clean(self):
-        cleaned_data = super().clean()
-        phone_number = cleaned_data.get('phone_number')
-        is_primary = cleaned_data.get('is_primary')
-        
-        if phone_number and self.user:
-            # Check if phone number already exists for this user
-            existing = UserPhoneNumber.objects.filter(
-                user=self.user, 
-                phone_number=phone_number
-            ).exclude(pk=self.instance.pk if self.instance else None)
-            
-            if existing.exists():
-                raise forms.ValidationError("This phone number is already registered for your account.")
-        
-        return cleaned_data
+    def validate_unique(self):
+        """Validate (user, phone_number) uniqueness even though user is not a form field"""
+        exclude = self._get_validation_exclusions()
+        # New numbers are checked by the view's get_or_create; only edits need a probe
+        if self.user and self.instance.pk:
+            # Bind the owner so the model's unique_together check covers it
+            self.instance.user = self.user
+            exclude.discard('user')
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except forms.ValidationError as e:
+            self._update_errors(e)
 
 
 class PhoneNumberVerificationForm(forms.Form):
@@ -170,6 +187,6 @@ class PhoneNumberVerificationForm(forms.Form):
     
     def clean_verification_code(self):
         code = self.cleaned_data['verification_code']
-        if not code.isdigit() or len(code) != 6:
+        if not _compiled(r'\A[0-9]{6}\Z').match(code):
             raise forms.ValidationError("Please enter a valid 6-digit verification code.")
         return code
\ No newline at end of file
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:45
+
+import django.core.validators
+import re
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_shared_phone_validator'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='phone_number',
+            field=models.CharField(blank=True, help_text='Primary phone number for contact', max_length=17, validators=[django.core.validators.RegexValidator(message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed.", regex=re.compile('\\A\\+?1?\\d{9,15}\\Z'))]),
+        ),
+        migrations.AlterField(
+            model_name='userphonenumber',
+            name='phone_number',
+            field=models.CharField(max_length=17, validators=[django.core.validators.RegexValidator(message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed.", regex=re.compile('\\A\\+?1?\\d{9,15}\\Z'))]),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_anchor_phone_regex'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='userphonenumber',
+            index=models.Index(fields=['user', 'is_primary'], name='accounts_us_user_id_4ea2c7_idx'),
+        ),
+    ]
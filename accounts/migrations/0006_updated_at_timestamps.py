@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_userphonenumber_user_primary_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='userphonenumber',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
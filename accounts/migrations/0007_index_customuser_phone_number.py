@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:50
+
+import django.core.validators
+import re
+from django.db import migrations, models
+
+
+def create_phone_trigram_index(apps, schema_editor):
+    # Trigram index for the admin's ILIKE '%...%' search; PostgreSQL only
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS accounts_customuser_phone_trgm '
+        'ON accounts_customuser USING gin (phone_number gin_trgm_ops)'
+    )
+
+
+def drop_phone_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS accounts_customuser_phone_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_updated_at_timestamps'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='phone_number',
+            field=models.CharField(blank=True, db_index=True, help_text='Primary phone number for contact', max_length=17, validators=[django.core.validators.RegexValidator(message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed.", regex=re.compile('\\A\\+?1?\\d{9,15}\\Z'))]),
+        ),
+        migrations.RunPython(create_phone_trigram_index, drop_phone_trigram_index),
+    ]
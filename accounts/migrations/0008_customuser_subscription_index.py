@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_index_customuser_phone_number'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('parking', '0009_alter_phonenumbermasking_masked_phone'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['is_subscription_active', 'subscription_end_date'], name='accounts_cu_is_subs_e2bab7_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_customuser_subscription_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userphonenumber',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='phone_numbers', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:16
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_active_qr_count(apps, schema_editor):
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    Vehicle = apps.get_model('parking', 'Vehicle')
+    active_count = Vehicle.objects.filter(
+        user=OuterRef('pk'), is_qr_active=True
+    ).order_by().values('user').annotate(total=Count('pk')).values('total')
+    CustomUser.objects.update(active_qr_count=Coalesce(Subquery(active_count), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_userphonenumber_drop_redundant_user_index'),
+        ('parking', '0019_vehicle_scan_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='active_qr_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_active_qr_count, migrations.RunPython.noop),
+    ]
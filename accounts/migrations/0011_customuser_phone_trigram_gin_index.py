@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-16 10:35
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+try:
+    from django.contrib.postgres.operations import TrigramExtension
+except ImportError:
+    # psycopg not installed, so the database is not PostgreSQL and needs no extension
+    TrigramExtension = None
+
+
+def drop_raw_phone_trigram_index(apps, schema_editor):
+    # Replaced by the GinIndex below; 0007 created it with raw SQL on PostgreSQL only
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS accounts_customuser_phone_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_customuser_active_qr_count'),
+    ]
+
+    operations = [
+        *([TrigramExtension()] if TrigramExtension is not None else []),
+        migrations.RunPython(drop_raw_phone_trigram_index, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['phone_number'], name='accounts_customuser_phone_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
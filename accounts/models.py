@@ -1,22 +1,31 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models, transaction
 from django.core.validators import RegexValidator
+from django.utils import timezone
+import re
+
+
+# Phone number validation, compiled once and shared by models and forms
+PHONE_RE = re.compile(r'\A\+?1?\d{9,15}\Z')
+PHONE_VALIDATOR = RegexValidator(
+    regex=PHONE_RE,
+    message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
+)
 
 
 class CustomUser(AbstractUser):
     """Custom user model with phone number support"""
     
     # Phone number validation
-    phone_regex = RegexValidator(
-        regex=r'^\+?1?\d{9,15}$',
-        message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed."
-    )
+    phone_regex = PHONE_VALIDATOR
     
     # Additional fields
     phone_number = models.CharField(
         validators=[phone_regex], 
         max_length=17, 
         blank=True,
+        db_index=True,
         help_text="Primary phone number for contact"
     )
     is_phone_verified = models.BooleanField(default=False)
@@ -35,12 +44,41 @@ class CustomUser(AbstractUser):
     subscription_end_date = models.DateTimeField(null=True, blank=True)
     is_subscription_active = models.BooleanField(default=False)
     
+    # Number of the user's vehicles with an active QR code, kept in sync by
+    # Vehicle.save()/delete() so stats don't need a COUNT per page load
+    active_qr_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    # Bumped whenever the user or their phone numbers/vehicles change; used
+    # as the version key for cached template fragments
+    updated_at = models.DateTimeField(auto_now=True)
+    
     def __str__(self):
         return self.username
     
+    @classmethod
+    def touch(cls, *user_ids):
+        """Bump updated_at without loading or re-saving the user rows"""
+        cls.objects.filter(pk__in=user_ids).update(updated_at=timezone.now())
+    
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        indexes = [
+            models.Index(fields=['is_subscription_active', 'subscription_end_date']),
+            # Trigram index for the admin's ILIKE '%...%' search (a plain index outside PostgreSQL)
+            GinIndex(fields=['phone_number'], opclasses=['gin_trgm_ops'], name='accounts_customuser_phone_trgm'),
+        ]
+
+
+class UserPhoneNumberQuerySet(models.QuerySet):
+    """QuerySet that invalidates owners' cached counts on bulk deletes"""
+    
+    def delete(self):
+        # Bulk deletes skip UserPhoneNumber.delete(), so bump the affected owners here
+        user_ids = set(self.values_list('user_id', flat=True))
+        result = super().delete()
+        CustomUser.touch(*user_ids)
+        return result
 
 
 class UserPhoneNumber(models.Model):
@@ -49,7 +87,8 @@ class UserPhoneNumber(models.Model):
     user = models.ForeignKey(
         CustomUser, 
         on_delete=models.CASCADE, 
-        related_name='phone_numbers'
+        related_name='phone_numbers',
+        db_index=False  # Covered by the (user, ...) unique and composite indexes
     )
     phone_number = models.CharField(
         max_length=17,
@@ -59,16 +98,31 @@ class UserPhoneNumber(models.Model):
     is_verified = models.BooleanField(default=False)
     label = models.CharField(max_length=50, blank=True, help_text="e.g., Work, Home, Mobile")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    objects = UserPhoneNumberQuerySet.as_manager()
     
     class Meta:
         unique_together = ['user', 'phone_number']
         ordering = ['-is_primary', '-created_at']
+        indexes = [
+            models.Index(fields=['user', 'is_primary']),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.phone_number}"
     
     def save(self, *args, **kwargs):
         # Ensure only one primary number per user
-        if self.is_primary:
-            UserPhoneNumber.objects.filter(user=self.user, is_primary=True).update(is_primary=False)
-        super().save(*args, **kwargs)
\ No newline at end of file
+        with transaction.atomic():
+            if self.is_primary:
+                UserPhoneNumber.objects.filter(
+                    user_id=self.user_id, is_primary=True
+                ).exclude(pk=self.pk).update(is_primary=False)
+            super().save(*args, **kwargs)
+            CustomUser.touch(self.user_id)
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        CustomUser.touch(self.user_id)
+        return result
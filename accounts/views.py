@@ -1,5 +1,6 @@
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth import login, authenticate
+from django.contrib.auth import login, update_session_auth_hash
+from django.contrib.auth.forms import PasswordChangeForm
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth.views import LoginView, LogoutView
@@ -9,7 +10,21 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import JsonResponse
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
+from django.db.models import BooleanField, Case, Value, When, prefetch_related_objects
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+import hashlib
 import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    # orjson not installed, fall back to the standard library parser
+    orjson = None
+
+# Minimum interval between verification codes sent to the same number
+VERIFICATION_RESEND_SECONDS = 60
 
 from .forms import (
     CustomUserCreationForm, CustomUserProfileForm, 
@@ -41,13 +56,10 @@ class SignUpView(CreateView):
         except SubscriptionPlan.DoesNotExist:
             messages.warning(self.request, 'Free plan not found. Please contact support.')
         
-        # Log the user in after successful registration
-        username = form.cleaned_data.get('username')
-        password = form.cleaned_data.get('password1')
-        user = authenticate(username=username, password=password)
-        if user:
-            login(self.request, user)
-            messages.success(self.request, 'Account created successfully! Welcome to ParkPing with your Free plan!')
+        # Log the freshly created user in directly; re-authenticating would
+        # only hash the password we just set a second time
+        login(self.request, self.object, backend='accounts.backends.PlanAwareModelBackend')
+        messages.success(self.request, 'Account created successfully! Welcome to ParkPing with your Free plan!')
         return response
 
 
@@ -64,6 +76,7 @@ class CustomLoginView(LoginView):
 def profile_view(request):
     """View for user profile"""
     from parking.models import Vehicle, QRCodeScan
+    from parking.utils import get_plan_usage_count, get_total_scan_count
     from django.utils import timezone
     from datetime import timedelta
     
@@ -80,15 +93,15 @@ def profile_view(request):
     vehicles = Vehicle.objects.filter(user=request.user).order_by('-created_at')
     
     # Get recent QR code scans (last 7 days)
-    recent_scans = QRCodeScan.objects.filter(
+    recent_scans = list(QRCodeScan.objects.filter(
         vehicle__user=request.user,
         scanned_at__gte=timezone.now() - timedelta(days=7)
-    ).order_by('-scanned_at')[:5]
+    ).select_related('vehicle').order_by('-scanned_at')[:5])
     
-    # Calculate some stats
-    total_vehicles = vehicles.count()
-    active_qr_count = vehicles.filter(is_qr_active=True).count()
-    total_scans = QRCodeScan.objects.filter(vehicle__user=request.user).count()
+    # Calculate some stats, from cached counts rather than a COUNT per page view
+    total_vehicles = get_plan_usage_count(request.user, 'vehicles')
+    active_qr_count = request.user.active_qr_count
+    total_scans = get_total_scan_count(request.user)
     
     context = {
         'form': form,
@@ -105,12 +118,15 @@ def profile_view(request):
 @login_required
 def phone_numbers_view(request):
     """View for managing phone numbers"""
-    phone_numbers = UserPhoneNumber.objects.filter(user=request.user)
+    phone_numbers = UserPhoneNumber.objects.filter(user=request.user).only(
+        'phone_number', 'is_primary', 'is_verified', 'label', 'created_at'
+    )
     
     # Check subscription limits
     user_plan = request.user.current_plan
     max_phone_numbers = user_plan.max_phone_numbers if user_plan else 1
-    current_count = phone_numbers.count()
+    # len() evaluates the queryset once; the template's count and loops reuse the cache
+    current_count = len(phone_numbers)
     
     if request.method == 'POST':
         # Check if user can add more phone numbers
@@ -120,11 +136,19 @@ def phone_numbers_view(request):
             
         form = UserPhoneNumberForm(request.POST, user=request.user)
         if form.is_valid():
-            phone_number = form.save(commit=False)
-            phone_number.user = request.user
-            phone_number.save()
-            messages.success(request, 'Phone number added successfully!')
-            return redirect('accounts:phone_numbers')
+            # get_or_create enforces (user, phone_number) uniqueness atomically
+            phone_number, created = UserPhoneNumber.objects.get_or_create(
+                user=request.user,
+                phone_number=form.cleaned_data['phone_number'],
+                defaults={
+                    'label': form.cleaned_data.get('label', ''),
+                    'is_primary': form.cleaned_data.get('is_primary', False),
+                }
+            )
+            if created:
+                messages.success(request, 'Phone number added successfully!')
+                return redirect('accounts:phone_numbers')
+            form.add_error(None, "This phone number is already registered for your account.")
     else:
         form = UserPhoneNumberForm(user=request.user)
     
@@ -167,7 +191,7 @@ def delete_phone_number(request, pk):
     phone_number = get_object_or_404(UserPhoneNumber, pk=pk, user=request.user)
     
     # Don't allow deletion if it's the only phone number
-    if UserPhoneNumber.objects.filter(user=request.user).count() <= 1:
+    if not UserPhoneNumber.objects.filter(user=request.user).exclude(pk=pk).exists():
         messages.error(request, 'Cannot delete the only phone number. Please add another one first.')
         return redirect('accounts:phone_numbers')
     
@@ -182,10 +206,14 @@ def set_primary_phone(request, pk):
     """View for setting primary phone number"""
     phone_number = get_object_or_404(UserPhoneNumber, pk=pk, user=request.user)
     
-    # Set this as primary
-    UserPhoneNumber.objects.filter(user=request.user, is_primary=True).update(is_primary=False)
-    phone_number.is_primary = True
-    phone_number.save()
+    # Set this as primary and demote the rest in a single UPDATE
+    UserPhoneNumber.objects.filter(user=request.user).update(
+        is_primary=Case(
+            When(pk=phone_number.pk, then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        )
+    )
     
     messages.success(request, f'{phone_number.phone_number} is now your primary phone number!')
     return redirect('accounts:phone_numbers')
@@ -202,12 +230,12 @@ def verify_phone_number(request, pk):
             # In a real application, you would verify the code here
             # For now, we'll just mark it as verified
             phone_number.is_verified = True
-            phone_number.save()
+            phone_number.save(update_fields=['is_verified'])
             
             # Update user's primary phone verification status if this is the primary
             if phone_number.is_primary:
                 request.user.is_phone_verified = True
-                request.user.save()
+                request.user.save(update_fields=['is_phone_verified'])
             
             messages.success(request, 'Phone number verified successfully!')
             return redirect('accounts:phone_numbers')
@@ -228,12 +256,25 @@ def verify_phone_number(request, pk):
 def send_verification_code(request):
     """API endpoint for sending verification codes"""
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body) if orjson else json.loads(request.body)
         phone_number = data.get('phone_number')
         
         if not phone_number:
             return JsonResponse({'error': 'Phone number is required'}, status=400)
         
+        # Key the throttle on the number's digits, hashed, so formatting variants
+        # share a window and raw input never reaches the cache key
+        digits = re.sub(r'\D', '', str(phone_number))
+        if not digits:
+            return JsonResponse({'error': 'Invalid phone number'}, status=400)
+        throttle_key = f'verification_code_sent:{hashlib.sha256(digits.encode()).hexdigest()}'
+        
+        # Deduplicate repeat clicks so the SMS service is hit at most once per window
+        if not cache.add(throttle_key, True, VERIFICATION_RESEND_SECONDS):
+            return JsonResponse({
+                'error': 'Verification code already sent. Please wait before requesting another.'
+            }, status=429)
+        
         # In a real application, you would integrate with SMS service here
         # For now, we'll just return success
         return JsonResponse({
@@ -251,6 +292,13 @@ def send_verification_code(request):
 def dashboard_view(request):
     """Dashboard view for authenticated users"""
     user = request.user
+    
+    # The overview fragment is cached per user version; when it has to be
+    # rendered, prefetch the related rows so the template's counts,
+    # truthiness checks and slices are served from the prefetch cache
+    fragment_key = make_template_fragment_key('dashboard_overview', [user.pk, user.updated_at])
+    if cache.get(fragment_key) is None:
+        prefetch_related_objects([user], 'current_plan', 'vehicles', 'phone_numbers')
     vehicles = user.vehicles.all()
     phone_numbers = user.phone_numbers.all()
     
@@ -277,29 +325,17 @@ def dashboard_view(request):
 def change_password_view(request):
     """View for changing user password"""
     if request.method == 'POST':
-        old_password = request.POST.get('old_password')
-        new_password1 = request.POST.get('new_password1')
-        new_password2 = request.POST.get('new_password2')
-        
-        # Validate old password
-        if not request.user.check_password(old_password):
-            messages.error(request, 'Your old password was entered incorrectly. Please enter it again.')
-            return redirect('accounts:profile')
-        
-        # Validate new passwords match
-        if new_password1 != new_password2:
-            messages.error(request, 'The two password fields didn\'t match.')
-            return redirect('accounts:profile')
-        
-        # Validate password strength
-        if len(new_password1) < 8:
-            messages.error(request, 'This password is too short. It must contain at least 8 characters.')
-            return redirect('accounts:profile')
-        
-        # Set new password
-        request.user.set_password(new_password1)
-        request.user.save()
-        messages.success(request, 'Your password was successfully updated!')
+        form = PasswordChangeForm(request.user, request.POST)
+        if form.is_valid():
+            user = form.save(commit=False)
+            user.save(update_fields=['password'])
+            # Keep the current session valid after the password hash changes
+            update_session_auth_hash(request, user)
+            messages.success(request, 'Your password was successfully updated!')
+        else:
+            for errors in form.errors.values():
+                for error in errors:
+                    messages.error(request, error)
         return redirect('accounts:profile')
     
     return redirect('accounts:profile')
@@ -40,6 +40,9 @@ ALLOWED_HOSTS = ["*"]
 # Set this as an environment variable or in .env file
 BASE_URL = os.environ.get('BASE_URL', '') 
 
+# Public site URL encoded in QR codes; falls back to BASE_URL
+SITE_URL = os.environ.get('SITE_URL', BASE_URL)
+
 # CSRF Trusted Origins - Required for ngrok and external domains
 # Automatically add BASE_URL if it's set
 CSRF_TRUSTED_ORIGINS = []
@@ -107,6 +110,19 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Shared by every worker process, so plan caches, throttles and scan
+# de-duplication stay consistent. Create the table with `createcachetable`.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -162,6 +178,13 @@ LOGOUT_REDIRECT_URL = '/'
 # Custom user model
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
+# Load the current plan with the session user; ModelBackend stays listed so
+# sessions created before the switch remain valid
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.PlanAwareModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 # WhiteNoise configuration
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
@@ -186,4 +209,9 @@ EMERGENCY_NUMBERS = {
 # Set this as an environment variable or in .env file
 GROQ_API_KEY = os.environ.get('GROQ_API_KEY', '')
 
-
+# Click-to-call API Configuration
+# Set these as environment variables or in .env file
+CLICK_TO_CALL_API_URL = os.environ.get('CLICK_TO_CALL_API_URL', 'https://msg.msgclub.net/rest/services/clicktocall/sendclicktocall')
+CLICK_TO_CALL_AUTH_KEY = os.environ.get('CLICK_TO_CALL_AUTH_KEY', '')  # calling is disabled while unset
+CLICK_TO_CALL_ROUTE_ID = os.environ.get('CLICK_TO_CALL_ROUTE_ID', '40')
+CLICK_TO_CALL_SENDER_ID = os.environ.get('CLICK_TO_CALL_SENDER_ID', '7317177510')
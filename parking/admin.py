@@ -1,8 +1,62 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 from .models import (
     SubscriptionPlan, Vehicle, QRCodeScan, 
     ParkingSession, UserSubscription, PhoneNumberMasking
 )
+from .utils import get_plan_lookups
+
+
+class FasterAdminPaginator(Paginator):
+    """Paginator that estimates unfiltered changelist counts from table statistics"""
+    
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        # Only unfiltered PostgreSQL tables have a cheap estimate available
+        if connection.vendor != 'postgresql' or queryset.query.where:
+            return super().count
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 until the table has been analyzed
+        if not row or row[0] < 0:
+            return super().count
+        return row[0]
+
+
+class PlanFilter(admin.SimpleListFilter):
+    """Filter by plan using a cached plan list instead of querying on every render"""
+    title = 'plan'
+    parameter_name = 'plan'
+    
+    def lookups(self, request, model_admin):
+        return get_plan_lookups()
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(plan_id=self.value())
+        return queryset
+
+
+class VehicleTypeFilter(admin.SimpleListFilter):
+    """Filter by the related vehicle's type using the static type choices"""
+    title = 'vehicle type'
+    parameter_name = 'vehicle_type'
+    
+    def lookups(self, request, model_admin):
+        return Vehicle.VEHICLE_TYPES
+    
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(vehicle__vehicle_type=self.value())
+        return queryset
 
 
 @admin.register(SubscriptionPlan)
@@ -48,6 +102,18 @@ class QRCodeScanInline(admin.TabularInline):
     extra = 0
     readonly_fields = ['scanned_at', 'scanned_by_ip', 'scanned_by_user_agent']
     can_delete = False
+    
+    def get_queryset(self, request):
+        """Join the vehicle used by each row's __str__"""
+        return super().get_queryset(request).select_related('vehicle')
+    
+    def has_add_permission(self, request, obj=None):
+        """Rows are an audit trail; skip the empty add form"""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        """Render existing rows read-only instead of as bound forms"""
+        return False
 
 
 class ParkingSessionInline(admin.TabularInline):
@@ -55,6 +121,18 @@ class ParkingSessionInline(admin.TabularInline):
     extra = 0
     readonly_fields = ['start_time', 'end_time', 'status']
     can_delete = False
+    
+    def get_queryset(self, request):
+        """Join the vehicle used by each row's __str__"""
+        return super().get_queryset(request).select_related('vehicle')
+    
+    def has_add_permission(self, request, obj=None):
+        """Rows are an audit trail; skip the empty add form"""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        """Render existing rows read-only instead of as bound forms"""
+        return False
 
 
 @admin.register(Vehicle)
@@ -72,6 +150,10 @@ class VehicleAdmin(admin.ModelAdmin):
         'make', 'model', 'vin'
     ]
     ordering = ['-created_at']
+    list_select_related = ['user']
+    paginator = FasterAdminPaginator
+    show_full_count = False
+    autocomplete_fields = ['user']
     
     fieldsets = (
         ('Vehicle Information', {
@@ -97,6 +179,18 @@ class VehicleAdmin(admin.ModelAdmin):
     
     readonly_fields = ['qr_unique_id', 'created_at', 'updated_at']
     inlines = [QRCodeScanInline, ParkingSessionInline]
+    
+    def get_queryset(self, request):
+        """Load only the listed columns on the changelist"""
+        queryset = super().get_queryset(request)
+        match = request.resolver_match
+        if match and match.url_name == 'parking_vehicle_changelist':
+            queryset = queryset.only(
+                'license_plate', 'user__username', 'vehicle_type', 'make', 'model',
+                'year', 'color', 'is_qr_active', 'show_phone', 'show_name',
+                'masking_enabled', 'created_at'
+            )
+        return queryset
 
 
 @admin.register(QRCodeScan)
@@ -104,9 +198,13 @@ class QRCodeScanAdmin(admin.ModelAdmin):
     list_display = [
         'vehicle', 'scanned_at', 'scanned_by_ip', 'location_lat', 'location_lng'
     ]
-    list_filter = ['scanned_at', 'vehicle__vehicle_type']
-    search_fields = ['vehicle__license_plate', 'vehicle__user__username']
+    list_filter = ['scanned_at', VehicleTypeFilter]
+    search_fields = ['scanned_by_ip']
     ordering = ['-scanned_at']
+    list_select_related = ['vehicle', 'vehicle__user']
+    paginator = FasterAdminPaginator
+    show_full_count = False
+    autocomplete_fields = ['vehicle']
     
     fieldsets = (
         ('Scan Information', {
@@ -125,11 +223,13 @@ class ParkingSessionAdmin(admin.ModelAdmin):
     list_display = [
         'vehicle', 'start_time', 'end_time', 'status', 'location_name'
     ]
-    list_filter = ['status', 'start_time', 'vehicle__vehicle_type']
-    search_fields = [
-        'vehicle__license_plate', 'vehicle__user__username', 'location_name'
-    ]
+    list_filter = ['status', 'start_time', VehicleTypeFilter]
+    search_fields = ['location_name']
     ordering = ['-start_time']
+    list_select_related = ['vehicle', 'vehicle__user']
+    paginator = FasterAdminPaginator
+    show_full_count = False
+    autocomplete_fields = ['vehicle']
     
     fieldsets = (
         ('Session Information', {
@@ -152,9 +252,11 @@ class UserSubscriptionAdmin(admin.ModelAdmin):
         'user', 'plan', 'status', 'start_date', 'end_date',
         'amount_paid', 'payment_method'
     ]
-    list_filter = ['status', 'plan', 'start_date', 'end_date']
+    list_filter = ['status', PlanFilter, 'start_date', 'end_date']
     search_fields = ['user__username', 'user__email', 'plan__name', 'transaction_id']
     ordering = ['-created_at']
+    list_select_related = ['user', 'plan']
+    autocomplete_fields = ['user']
     
     fieldsets = (
         ('Subscription Information', {
@@ -188,6 +290,7 @@ class PhoneNumberMaskingAdmin(admin.ModelAdmin):
     ]
     ordering = ['-created_at']
     readonly_fields = ['session_id', 'created_at', 'call_count', 'last_called_at']
+    autocomplete_fields = ['vehicle']
     
     fieldsets = (
         ('Session Information', {
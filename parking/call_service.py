@@ -4,25 +4,81 @@ Call Service for Connecting Users
 This module handles connecting two phone numbers using the click-to-call API.
 """
 
+import json
+import logging
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, Dict, Any
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+NON_DIGIT_RE = re.compile(r'\D')
+
+# API configuration, read once at import rather than on every call
+CLICK_TO_CALL_URL = f"{settings.CLICK_TO_CALL_API_URL}?AUTH_KEY={settings.CLICK_TO_CALL_AUTH_KEY}"
+CLICK_TO_CALL_HEADERS = {"Content-Type": "application/json"}
+CLICK_TO_CALL_PAYLOAD = {
+    "routeId": settings.CLICK_TO_CALL_ROUTE_ID,
+    "senderId": settings.CLICK_TO_CALL_SENDER_ID,
+    "callInitiator": "client",
+    "maxCallDuration": "2",
+    "retryAttempt": "3",
+    "retryDuration": "60"
+}
+# The request body only varies by the two numbers, so the fixed part is encoded once
+# and the digit-only numbers are spliced in with plain string formatting
+CLICK_TO_CALL_BODY_PREFIX = json.dumps(CLICK_TO_CALL_PAYLOAD)[:-1]
+# (connect, read) seconds, so a hung API can't hold a dispatch worker indefinitely
+CLICK_TO_CALL_TIMEOUT = (3.05, 10)
+
+# One pooled HTTP session per process, so calls reuse the TLS connection
+_session = None
+_session_lock = threading.Lock()
+
+# Background workers for outbound calls, so views don't wait on the API round-trip
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='call-dispatch')
+# Calls running or waiting for a worker; beyond this, new calls are refused instead of queued
+MAX_PENDING_CALLS = 64
+_pending_calls = threading.BoundedSemaphore(MAX_PENDING_CALLS)
+
 
 class CallService:
     """
     Service to handle call connections between two phone numbers.
     """
     
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """
+        Return the shared keep-alive session, creating it on first use.
+        """
+        global _session
+        if _session is None:
+            with _session_lock:
+                if _session is None:
+                    session = requests.Session()
+                    # Only retry failed connects: a POST that reached the API may already have dialled
+                    retries = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.1)
+                    session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries))
+                    _session = session
+        return _session
+    
     @classmethod
     def format_phone_number(cls, phone_number: str) -> str:
         """
-        Format phone number.
+        Format phone number as its last 10 digits.
         """
-        digits = re.sub(r'\D', '', phone_number)
-        
-        if len(digits) >= 10:
-            return digits[-10:]
-        return digits
+        # Slicing leaves shorter numbers untouched, so no length check is needed
+        return NON_DIGIT_RE.sub('', phone_number)[-10:]
     
     @classmethod
     def connect_call(cls, owner_number: str, scanner_number: str, qr_id: str, base_url: Optional[str] = None) -> Dict[str, Any]:
@@ -31,25 +87,13 @@ class CallService:
         """
         owner_formatted = cls.format_phone_number(owner_number)
         scanner_formatted = cls.format_phone_number(scanner_number)
-
-        print(owner_formatted)
-        print(scanner_formatted)
-        
-        url = "https://msg.msgclub.net/rest/services/clicktocall/sendclicktocall?AUTH_KEY=73efcfe5fedd98e5b108f456d2a8197"
         
-        payload = {
-            "routeId": "40",
-            "senderId": "7317177510",
-            "mobileNumbers": scanner_formatted,
-            "agentNumbers": owner_formatted,
-            "callInitiator": "client",
-            "maxCallDuration": "2",
-            "retryAttempt": "3",
-            "retryDuration": "60"
-        }
+        body = f'{CLICK_TO_CALL_BODY_PREFIX}, "mobileNumbers": "{scanner_formatted}", "agentNumbers": "{owner_formatted}"}}'
         
         try:
-            response = requests.post(url, json=payload, headers={"Content-Type": "application/json"})
+            response = cls._get_session().post(
+                CLICK_TO_CALL_URL, data=body.encode(), headers=CLICK_TO_CALL_HEADERS, timeout=CLICK_TO_CALL_TIMEOUT
+            )
             response.raise_for_status()
             
             # The API returns a JSON response
@@ -70,10 +114,75 @@ class CallService:
                 'error': str(e)
             }
     
+    @classmethod
+    def dispatch_call(cls, masking_session_id: int, owner_number: str, scanner_number: str, qr_id: str):
+        """
+        Queue a call on the background pool and return the future, or None if the queue is full.
+        """
+        if not _pending_calls.acquire(blocking=False):
+            logger.warning('Call dispatch queue full, refusing call for masking session %s', masking_session_id)
+            return None
+        try:
+            return _executor.submit(cls._run_dispatched_call, masking_session_id, owner_number, scanner_number, qr_id)
+        except Exception:
+            _pending_calls.release()
+            raise
+    
+    @classmethod
+    def _run_dispatched_call(cls, masking_session_id: int, owner_number: str, scanner_number: str, qr_id: str) -> Dict[str, Any]:
+        """
+        Place the call and record the result on the masking session.
+        """
+        from .models import PhoneNumberMasking
+        
+        sessions = PhoneNumberMasking.objects.filter(pk=masking_session_id)
+        try:
+            call_result = cls.connect_call(
+                owner_number=owner_number,
+                scanner_number=scanner_number,
+                qr_id=qr_id
+            )
+            if call_result.get('success'):
+                sessions.update(
+                    twilio_call_sid=call_result.get('call_sid'),
+                    call_status=PhoneNumberMasking.CallStatus.INITIATED,
+                    call_error='',
+                    call_count=F('call_count') + 1,
+                    last_called_at=timezone.now()
+                )
+            else:
+                logger.error('Call for masking session %s failed: %s', masking_session_id, cls._public_error(call_result.get('error')))
+                sessions.update(
+                    call_status=PhoneNumberMasking.CallStatus.FAILED,
+                    call_error=cls._public_error(call_result.get('error'))
+                )
+            return call_result
+        except Exception as e:
+            logger.exception('Call dispatch for masking session %s raised', masking_session_id)
+            sessions.update(
+                call_status=PhoneNumberMasking.CallStatus.FAILED,
+                call_error=cls._public_error(e)
+            )
+            return {'success': False, 'error': str(e)}
+        finally:
+            _pending_calls.release()
+            # Worker threads outlive the request cycle, so release their connection explicitly
+            connection.close()
+    
+    @classmethod
+    def _public_error(cls, error) -> str:
+        """
+        Return an error message safe to show scanners, with the API key redacted.
+        """
+        message = str(error or 'Call failed')
+        if settings.CLICK_TO_CALL_AUTH_KEY:
+            message = message.replace(settings.CLICK_TO_CALL_AUTH_KEY, '***')
+        return message[:255]
+    
     @classmethod
     def validate_phone_number(cls, phone_number: str) -> bool:
         """
         Validate phone number format.
         """
-        digits = re.sub(r'\D', '', phone_number)
-        return len(digits) >= 10 and len(digits) <= 15
+        digits = NON_DIGIT_RE.sub('', phone_number)
+        return 10 <= len(digits) <= 15
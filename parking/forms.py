@@ -1,6 +1,11 @@
 from django import forms
-from .models import Vehicle, SubscriptionPlan, ParkingSession, VehicleContact
-from accounts.models import UserPhoneNumber
+from django.db.models import Q
+from .models import Vehicle, SubscriptionPlan, ParkingSession, VehicleContact, DEFAULT_HELPLINE
+
+# The helpline is always ParkPing's own number, so the help text is built once
+HELPLINE_HELP_TEXT = f"Show ParkPing helpline number ({DEFAULT_HELPLINE}) in QR code"
+
+CHECKBOX_INPUT_CLASS = 'h-4 w-4 text-green-600 focus:ring-green-500 border-gray-300 rounded'
 
 
 class VehicleForm(forms.ModelForm):
@@ -22,9 +27,9 @@ class VehicleForm(forms.ModelForm):
             'vin': forms.TextInput(attrs={'placeholder': '17-character VIN (optional)'}),
             'color': forms.TextInput(attrs={'placeholder': 'e.g., Red, Blue, White'}),
             'emergency_contact_number': forms.TextInput(attrs={'placeholder': 'e.g., +1234567890', 'class': 'w-full px-3 py-2 border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-green-500 focus:border-green-500 text-sm'}),
-            'show_emergency_contact': forms.CheckboxInput(attrs={'class': 'h-4 w-4 text-green-600 focus:ring-green-500 border-gray-300 rounded'}),
-            'show_helpline_number': forms.CheckboxInput(attrs={'class': 'h-4 w-4 text-green-600 focus:ring-green-500 border-gray-300 rounded'}),
-            'masking_enabled': forms.CheckboxInput(attrs={'class': 'h-4 w-4 text-green-600 focus:ring-green-500 border-gray-300 rounded'}),
+            'show_emergency_contact': forms.CheckboxInput(attrs={'class': CHECKBOX_INPUT_CLASS}),
+            'show_helpline_number': forms.CheckboxInput(attrs={'class': CHECKBOX_INPUT_CLASS}),
+            'masking_enabled': forms.CheckboxInput(attrs={'class': CHECKBOX_INPUT_CLASS}),
         }
     
     def __init__(self, *args, **kwargs):
@@ -39,9 +44,7 @@ class VehicleForm(forms.ModelForm):
         self.fields['emergency_contact_number'].help_text = "Optional: Add an emergency contact number to display in QR code"
         
         # Update helpline help text to indicate it's always ParkPing helpline
-        from django.conf import settings
-        default_helpline = getattr(settings, 'PARKPING_HELPLINE_NUMBER', '+1-800-727-5746')
-        self.fields['show_helpline_number'].help_text = f"Show ParkPing helpline number ({default_helpline}) in QR code"
+        self.fields['show_helpline_number'].help_text = HELPLINE_HELP_TEXT
         
         if self.user:
             # Masking is available for all plans
@@ -51,17 +54,39 @@ class VehicleForm(forms.ModelForm):
             else:
                 self.fields['masking_enabled'].help_text = "Enable number masking for this vehicle. When enabled, the first contact number you add will be used for call connections."
     
-    def clean_license_plate(self):
-        license_plate = self.cleaned_data['license_plate']
-        if Vehicle.objects.filter(license_plate=license_plate).exclude(pk=self.instance.pk if self.instance else None).exists():
-            raise forms.ValidationError("A vehicle with this license plate already exists.")
-        return license_plate
-    
-    def clean_vin(self):
-        vin = self.cleaned_data['vin']
-        if vin and Vehicle.objects.filter(vin=vin).exclude(pk=self.instance.pk if self.instance else None).exists():
-            raise forms.ValidationError("A vehicle with this VIN already exists.")
-        return vin
+    def clean(self):
+        cleaned_data = super().clean()
+        license_plate = cleaned_data.get('license_plate')
+        vin = cleaned_data.get('vin')
+        
+        # Check license plate and VIN uniqueness in a single query
+        lookup = Q()
+        if license_plate:
+            lookup |= Q(license_plate=license_plate)
+        if vin:
+            lookup |= Q(vin=vin)
+        if not lookup:
+            return cleaned_data
+        
+        conflicts = Vehicle.objects.filter(lookup).exclude(pk=self.instance.pk).only('license_plate', 'vin')[:2]
+        duplicate_fields = set()
+        for vehicle in conflicts:
+            if license_plate and vehicle.license_plate == license_plate:
+                duplicate_fields.add('license_plate')
+            if vin and vehicle.vin == vin:
+                duplicate_fields.add('vin')
+        
+        if 'license_plate' in duplicate_fields:
+            self.add_error('license_plate', "A vehicle with this license plate already exists.")
+        if 'vin' in duplicate_fields:
+            self.add_error('vin', "A vehicle with this VIN already exists.")
+        return cleaned_data
+    
+    def _get_validation_exclusions(self):
+        """Skip the model's license_plate and VIN probes; clean() has already checked both"""
+        exclude = super()._get_validation_exclusions()
+        exclude.update({'license_plate', 'vin'})
+        return exclude
 
 
 class ParkingSessionForm(forms.ModelForm):
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from parking.models import PhoneNumberMasking
+
+
+class Command(BaseCommand):
+    help = 'Mark masking sessions past their expiry time as expired (run periodically, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=0,
+            help='Expire at most this many rows per UPDATE to keep locks short on large tables (default: all at once)'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        expired_sessions = PhoneNumberMasking.objects.filter(
+            status='active',
+            expires_at__lt=timezone.now()
+        )
+        
+        if batch_size > 0:
+            expired = 0
+            while True:
+                pks = list(expired_sessions.values_list('pk', flat=True)[:batch_size])
+                if not pks:
+                    break
+                expired += PhoneNumberMasking.objects.filter(pk__in=pks).update(status='expired')
+        else:
+            # One UPDATE over the (status, expires_at) index
+            expired = expired_sessions.update(status='expired')
+        
+        self.stdout.write(self.style.SUCCESS(f'✓ Expired {expired} masking session(s)'))
@@ -1,5 +1,87 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from parking.models import SubscriptionPlan
+from parking.utils import invalidate_plan_caches
+
+
+DEFAULT_PLANS = [
+    {
+        'plan_type': 'free',
+        'name': 'Free Plan',
+        'description': 'Basic plan for getting started with ParkPing. Limited features but perfect for trying out the service.',
+        'price': 0.00,
+        'currency': 'INR',
+        'billing_cycle': 'monthly',
+        'max_vehicles': 1,
+        'max_phone_numbers': 1,
+        'number_masking': False,
+        'max_masking_sessions': 0,
+        'custom_qr_design': False,
+        'priority_support': False,
+        'analytics_dashboard': False,
+        'logo_placement': False,
+        'custom_branding': False,
+        'qr_color_primary': '#000000',
+        'qr_color_secondary': '#FFFFFF',
+    },
+    {
+        'plan_type': 'basic',
+        'name': 'Basic Plan',
+        'description': 'Perfect for individual users who want more features and flexibility.',
+        'price': 299.00,
+        'currency': 'INR',
+        'billing_cycle': 'monthly',
+        'max_vehicles': 3,
+        'max_phone_numbers': 2,
+        'number_masking': True,
+        'max_masking_sessions': 2,
+        'custom_qr_design': False,
+        'priority_support': False,
+        'analytics_dashboard': False,
+        'logo_placement': False,
+        'custom_branding': False,
+        'qr_color_primary': '#000000',
+        'qr_color_secondary': '#FFFFFF',
+    },
+    {
+        'plan_type': 'pro',
+        'name': 'Professional Plan',
+        'description': 'Advanced features for power users and small businesses. Includes custom QR design and analytics.',
+        'price': 599.00,
+        'currency': 'INR',
+        'billing_cycle': 'monthly',
+        'max_vehicles': 10,
+        'max_phone_numbers': 5,
+        'number_masking': True,
+        'max_masking_sessions': 5,
+        'custom_qr_design': True,
+        'priority_support': True,
+        'analytics_dashboard': True,
+        'logo_placement': True,
+        'custom_branding': False,
+        'qr_color_primary': '#000000',
+        'qr_color_secondary': '#FFFFFF',
+    },
+    {
+        'plan_type': 'enterprise',
+        'name': 'Enterprise Plan',
+        'description': 'Full-featured plan for large organizations and businesses. Includes all features and custom branding.',
+        'price': 1499.00,
+        'currency': 'INR',
+        'billing_cycle': 'monthly',
+        'max_vehicles': 50,
+        'max_phone_numbers': 20,
+        'number_masking': True,
+        'max_masking_sessions': 20,
+        'custom_qr_design': True,
+        'priority_support': True,
+        'analytics_dashboard': True,
+        'logo_placement': True,
+        'custom_branding': True,
+        'qr_color_primary': '#000000',
+        'qr_color_secondary': '#FFFFFF',
+    },
+]
 
 
 class Command(BaseCommand):
@@ -8,117 +90,29 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write('Setting up default subscription plans...')
         
-        # Free Plan
-        free_plan, created = SubscriptionPlan.objects.get_or_create(
-            plan_type='free',
-            defaults={
-                'name': 'Free Plan',
-                'description': 'Basic plan for getting started with ParkPing. Limited features but perfect for trying out the service.',
-                'price': 0.00,
-                'currency': 'INR',
-                'billing_cycle': 'monthly',
-                'max_vehicles': 1,
-                'max_phone_numbers': 1,
-                'number_masking': False,
-                'max_masking_sessions': 0,
-                'custom_qr_design': False,
-                'priority_support': False,
-                'analytics_dashboard': False,
-                'logo_placement': False,
-                'custom_branding': False,
-                'qr_color_primary': '#000000',
-                'qr_color_secondary': '#FFFFFF',
-            }
-        )
-        
-        if created:
-            self.stdout.write(self.style.SUCCESS('✓ Created Free Plan'))
-        else:
-            self.stdout.write('✓ Free Plan already exists')
-        
-        # Basic Plan
-        basic_plan, created = SubscriptionPlan.objects.get_or_create(
-            plan_type='basic',
-            defaults={
-                'name': 'Basic Plan',
-                'description': 'Perfect for individual users who want more features and flexibility.',
-                'price': 299.00,
-                'currency': 'INR',
-                'billing_cycle': 'monthly',
-                'max_vehicles': 3,
-                'max_phone_numbers': 2,
-                'number_masking': True,
-                'max_masking_sessions': 2,
-                'custom_qr_design': False,
-                'priority_support': False,
-                'analytics_dashboard': False,
-                'logo_placement': False,
-                'custom_branding': False,
-                'qr_color_primary': '#000000',
-                'qr_color_secondary': '#FFFFFF',
-            }
-        )
-        
-        if created:
-            self.stdout.write(self.style.SUCCESS('✓ Created Basic Plan'))
-        else:
-            self.stdout.write('✓ Basic Plan already exists')
-        
-        # Professional Plan
-        pro_plan, created = SubscriptionPlan.objects.get_or_create(
-            plan_type='pro',
-            defaults={
-                'name': 'Professional Plan',
-                'description': 'Advanced features for power users and small businesses. Includes custom QR design and analytics.',
-                'price': 599.00,
-                'currency': 'INR',
-                'billing_cycle': 'monthly',
-                'max_vehicles': 10,
-                'max_phone_numbers': 5,
-                'number_masking': True,
-                'max_masking_sessions': 5,
-                'custom_qr_design': True,
-                'priority_support': True,
-                'analytics_dashboard': True,
-                'logo_placement': True,
-                'custom_branding': False,
-                'qr_color_primary': '#000000',
-                'qr_color_secondary': '#FFFFFF',
-            }
-        )
+        plan_types = [plan['plan_type'] for plan in DEFAULT_PLANS]
         
-        if created:
-            self.stdout.write(self.style.SUCCESS('✓ Created Professional Plan'))
-        else:
-            self.stdout.write('✓ Professional Plan already exists')
+        with transaction.atomic():
+            plans = SubscriptionPlan.objects.in_bulk(plan_types, field_name='plan_type')
+            existing = set(plans)
+            # Insert only the missing plans in one statement; existing plans are
+            # left untouched so admin edits survive re-running the command
+            missing = [SubscriptionPlan(**plan) for plan in DEFAULT_PLANS if plan['plan_type'] not in existing]
+            if missing:
+                SubscriptionPlan.objects.bulk_create(missing, ignore_conflicts=True)
+                plans.update((plan.plan_type, plan) for plan in missing)
+        invalidate_plan_caches()
         
-        # Enterprise Plan
-        enterprise_plan, created = SubscriptionPlan.objects.get_or_create(
-            plan_type='enterprise',
-            defaults={
-                'name': 'Enterprise Plan',
-                'description': 'Full-featured plan for large organizations and businesses. Includes all features and custom branding.',
-                'price': 1499.00,
-                'currency': 'INR',
-                'billing_cycle': 'monthly',
-                'max_vehicles': 50,
-                'max_phone_numbers': 20,
-                'number_masking': True,
-                'max_masking_sessions': 20,
-                'custom_qr_design': True,
-                'priority_support': True,
-                'analytics_dashboard': True,
-                'logo_placement': True,
-                'custom_branding': True,
-                'qr_color_primary': '#000000',
-                'qr_color_secondary': '#FFFFFF',
-            }
-        )
+        for plan in DEFAULT_PLANS:
+            if plan['plan_type'] in existing:
+                self.stdout.write(f'✓ {plan["name"]} already exists')
+            else:
+                self.stdout.write(self.style.SUCCESS(f'✓ Created {plan["name"]}'))
         
-        if created:
-            self.stdout.write(self.style.SUCCESS('✓ Created Enterprise Plan'))
-        else:
-            self.stdout.write('✓ Enterprise Plan already exists')
+        free_plan = plans['free']
+        basic_plan = plans['basic']
+        pro_plan = plans['pro']
+        enterprise_plan = plans['enterprise']
         
         self.stdout.write(self.style.SUCCESS('\nAll subscription plans have been set up successfully!'))
         self.stdout.write('\nPlan Summary:')
@@ -5,14 +5,41 @@ This module provides mock functions for phone number masking functionality.
 In production, these would be replaced with actual masking service API calls.
 """
 
+import os
 import random
-import string
+import re
+import threading
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
 from django.utils import timezone
 from django.conf import settings
 
 
+# Mock configuration, read from settings once at import
+MASKING_DURATION_MINUTES = getattr(settings, 'MASKING_DURATION_MINUTES', 30)
+MASKING_PREFIX = getattr(settings, 'MASKING_PREFIX', '+1555')  # Mock prefix
+
+NON_DIGIT_RE = re.compile(r'\D')
+
+# Session ids are sliced from a per-thread block of OS randomness
+SESSION_ID_BYTES = 6
+_ENTROPY_BLOCK_SIZE = 4096
+_entropy = threading.local()
+
+
+def _next_session_id() -> str:
+    """Return 12 uppercase hex characters from the thread's entropy block."""
+    pid = os.getpid()
+    offset = getattr(_entropy, 'offset', _ENTROPY_BLOCK_SIZE)
+    # Refill when exhausted, or after a fork so workers never share bytes
+    if offset + SESSION_ID_BYTES > _ENTROPY_BLOCK_SIZE or getattr(_entropy, 'pid', None) != pid:
+        _entropy.block = os.urandom(_ENTROPY_BLOCK_SIZE)
+        _entropy.pid = pid
+        offset = 0
+    _entropy.offset = offset + SESSION_ID_BYTES
+    return _entropy.block[offset:offset + SESSION_ID_BYTES].hex().upper()
+
+
 class MockMaskingService:
     """
     Mock implementation of a phone number masking service.
@@ -23,8 +50,8 @@ class MockMaskingService:
     """
     
     # Mock configuration
-    MASKING_DURATION_MINUTES = getattr(settings, 'MASKING_DURATION_MINUTES', 30)
-    MASKING_PREFIX = getattr(settings, 'MASKING_PREFIX', '+1555')  # Mock prefix
+    MASKING_DURATION_MINUTES = MASKING_DURATION_MINUTES
+    MASKING_PREFIX = MASKING_PREFIX
     
     @classmethod
     def generate_masked_number(cls, original_number: str) -> str:
@@ -37,13 +64,9 @@ class MockMaskingService:
         Returns:
             A mock masked phone number
         """
-        # Remove any non-digit characters from original number
-        clean_number = ''.join(filter(str.isdigit, original_number))
-        
         # Generate a mock masked number using the prefix + random digits
         # In production, this would be handled by the masking service
-        random_suffix = ''.join(random.choices(string.digits, k=7))
-        masked_number = f"{cls.MASKING_PREFIX}{random_suffix}"
+        masked_number = f"{MASKING_PREFIX}{random.randrange(10_000_000):07d}"
         
         return masked_number
     
@@ -60,7 +83,7 @@ class MockMaskingService:
             Dictionary containing session details
         """
         if duration_minutes is None:
-            duration_minutes = cls.MASKING_DURATION_MINUTES
+            duration_minutes = MASKING_DURATION_MINUTES
             
         masked_number = cls.generate_masked_number(original_number)
         expires_at = timezone.now() + timedelta(minutes=duration_minutes)
@@ -149,7 +172,7 @@ class MockMaskingService:
     @classmethod
     def _generate_session_id(cls) -> str:
         """Generate a unique session ID."""
-        return ''.join(random.choices(string.ascii_uppercase + string.digits, k=12))
+        return _next_session_id()
     
     @classmethod
     def validate_phone_number(cls, phone_number: str) -> bool:
@@ -163,8 +186,22 @@ class MockMaskingService:
             True if valid, False otherwise
         """
         # Basic validation - remove non-digits and check length
-        clean_number = ''.join(filter(str.isdigit, phone_number))
-        return len(clean_number) >= 10 and len(clean_number) <= 15
+        clean_number = NON_DIGIT_RE.sub('', phone_number)
+        return 10 <= len(clean_number) <= 15
+    
+    @classmethod
+    def validate_phone_numbers_bulk(cls, phone_numbers: Iterable[str]) -> List[bool]:
+        """
+        Validate many phone numbers at once, e.g. for bulk imports.
+        
+        Args:
+            phone_numbers: Phone numbers to validate
+            
+        Returns:
+            A list of booleans in the same order as the input
+        """
+        strip = NON_DIGIT_RE.sub
+        return [10 <= len(strip('', number)) <= 15 for number in phone_numbers]
 
 
 # Convenience functions for easy import
@@ -187,3 +224,7 @@ def validate_phone_number(phone_number: str) -> bool:
     """Validate a phone number format."""
     return MockMaskingService.validate_phone_number(phone_number)
 
+
+def validate_phone_numbers_bulk(phone_numbers: Iterable[str]) -> List[bool]:
+    """Validate many phone number formats."""
+    return MockMaskingService.validate_phone_numbers_bulk(phone_numbers)
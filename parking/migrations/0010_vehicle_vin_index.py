@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_customuser_subscription_index'),
+        ('parking', '0009_alter_phonenumbermasking_masked_phone'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['vin'], name='parking_veh_vin_bdd8bc_idx'),
+        ),
+    ]
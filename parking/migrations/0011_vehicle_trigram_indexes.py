@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:40
+
+from django.db import migrations
+
+
+def create_vehicle_trigram_indexes(apps, schema_editor):
+    # Trigram indexes for the admin's ILIKE '%...%' search; PostgreSQL only
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS parking_vehicle_plate_trgm '
+        'ON parking_vehicle USING gin (license_plate gin_trgm_ops)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS parking_vehicle_vin_trgm '
+        'ON parking_vehicle USING gin (vin gin_trgm_ops)'
+    )
+
+
+def drop_vehicle_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS parking_vehicle_plate_trgm')
+    schema_editor.execute('DROP INDEX IF EXISTS parking_vehicle_vin_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0010_vehicle_vin_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_vehicle_trigram_indexes, drop_vehicle_trigram_indexes),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_customuser_subscription_index'),
+        ('parking', '0011_vehicle_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='vehicle',
+            name='parking_veh_vin_bdd8bc_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='vehicle',
+            constraint=models.UniqueConstraint(condition=models.Q(('vin', ''), _negated=True), fields=('vin',), name='uniq_vehicle_vin'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0012_vehicle_unique_vin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subscriptionplan',
+            index=models.Index(fields=['is_active', 'price'], name='parking_sub_is_acti_b68dd9_idx'),
+        ),
+    ]
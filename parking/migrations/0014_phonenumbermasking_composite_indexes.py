@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0013_subscriptionplan_active_price_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='phonenumbermasking',
+            name='parking_pho_masked__f8d3d7_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='phonenumbermasking',
+            name='parking_pho_expires_90d385_idx',
+        ),
+        migrations.AddIndex(
+            model_name='phonenumbermasking',
+            index=models.Index(fields=['masked_phone', 'status'], name='parking_pho_masked__cce2a9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='phonenumbermasking',
+            index=models.Index(fields=['status', 'expires_at'], name='parking_pho_status_012284_idx'),
+        ),
+    ]
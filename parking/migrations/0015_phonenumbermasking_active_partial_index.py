@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-15 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0014_phonenumbermasking_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='phonenumbermasking',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['vehicle'], name='pnm_active_vehicle_idx'),
+        ),
+    ]
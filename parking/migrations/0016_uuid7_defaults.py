@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:00
+
+import parking.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0015_phonenumbermasking_active_partial_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='phonenumbermasking',
+            name='session_id',
+            field=models.UUIDField(default=parking.utils.uuid7, help_text='Unique session identifier', unique=True),
+        ),
+        migrations.AlterField(
+            model_name='vehicle',
+            name='qr_unique_id',
+            field=models.UUIDField(default=parking.utils.uuid7, unique=True),
+        ),
+    ]
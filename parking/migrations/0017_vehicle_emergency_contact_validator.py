@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:04
+
+import django.core.validators
+import re
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0016_uuid7_defaults'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='vehicle',
+            name='emergency_contact_number',
+            field=models.CharField(blank=True, help_text='Emergency contact number to display in QR code', max_length=17, validators=[django.core.validators.RegexValidator(message="Phone number must be entered in the format: '+999999999'. Up to 15 digits allowed.", regex=re.compile('\\A\\+?1?\\d{9,15}\\Z'))]),
+        ),
+    ]
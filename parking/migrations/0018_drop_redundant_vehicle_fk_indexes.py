@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0017_vehicle_emergency_contact_validator'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='phonenumbermasking',
+            name='vehicle',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='masking_sessions', to='parking.vehicle'),
+        ),
+        migrations.AlterField(
+            model_name='vehiclecontact',
+            name='vehicle',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='contacts', to='parking.vehicle'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_userphonenumber_drop_redundant_user_index'),
+        ('parking', '0018_drop_redundant_vehicle_fk_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='qrcodescan',
+            name='vehicle',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='scans', to='parking.vehicle'),
+        ),
+        migrations.AlterField(
+            model_name='vehicle',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='vehicles', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='qrcodescan',
+            index=models.Index(fields=['vehicle', '-scanned_at'], name='parking_qrc_vehicle_aa815b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['user', 'is_qr_active'], name='parking_veh_user_id_2f537f_idx'),
+        ),
+    ]
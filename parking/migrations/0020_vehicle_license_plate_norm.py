@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-15 23:40
+
+import re
+
+from django.db import migrations, models
+
+
+def backfill_license_plate_norm(apps, schema_editor):
+    Vehicle = apps.get_model('parking', 'Vehicle')
+    vehicles = list(Vehicle.objects.only('pk', 'license_plate'))
+    for vehicle in vehicles:
+        vehicle.license_plate_norm = re.sub(r'[^0-9A-Z]', '', vehicle.license_plate.upper())
+    Vehicle.objects.bulk_update(vehicles, ['license_plate_norm'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0019_vehicle_scan_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='license_plate_norm',
+            field=models.CharField(db_index=True, default='', editable=False, help_text='Uppercase alphanumeric plate for search', max_length=20),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_license_plate_norm, migrations.RunPython.noop),
+    ]
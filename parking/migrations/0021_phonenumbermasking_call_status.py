@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0020_vehicle_license_plate_norm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='phonenumbermasking',
+            name='call_error',
+            field=models.CharField(blank=True, help_text='Error from the latest failed call', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='phonenumbermasking',
+            name='call_status',
+            field=models.CharField(blank=True, choices=[('queued', 'Queued'), ('initiated', 'Initiated'), ('failed', 'Failed')], help_text='Outcome of the latest dispatched call', max_length=20),
+        ),
+    ]
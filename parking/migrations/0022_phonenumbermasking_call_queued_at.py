@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-16 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0021_phonenumbermasking_call_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='phonenumbermasking',
+            name='call_queued_at',
+            field=models.DateTimeField(blank=True, help_text='When the latest call was queued', null=True),
+        ),
+    ]
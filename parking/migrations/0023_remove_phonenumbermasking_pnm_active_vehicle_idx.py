@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-16 10:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parking', '0022_phonenumbermasking_call_queued_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='phonenumbermasking',
+            name='pnm_active_vehicle_idx',
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-16 10:35
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+def drop_raw_vehicle_trigram_indexes(apps, schema_editor):
+    # Replaced by the GinIndexes below; 0011 created them with raw SQL on PostgreSQL only
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS parking_vehicle_plate_trgm')
+    schema_editor.execute('DROP INDEX IF EXISTS parking_vehicle_vin_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        # Installs the pg_trgm extension these indexes need
+        ('accounts', '0011_customuser_phone_trigram_gin_index'),
+        ('parking', '0023_remove_phonenumbermasking_pnm_active_vehicle_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_raw_vehicle_trigram_indexes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['license_plate'], name='parking_vehicle_plate_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['vin'], name='parking_vehicle_vin_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
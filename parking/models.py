@@ -1,18 +1,31 @@
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.core.cache import cache
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.core.validators import MinValueValidator, MaxValueValidator
-from accounts.models import CustomUser
-import uuid
+from django.utils import timezone
+from django.utils.functional import cached_property
+from accounts.models import CustomUser, PHONE_VALIDATOR
+from .utils import invalidate_plan_caches, normalize_plate, uuid7
+
+
+# ParkPing's own helpline, shown on QR pages and vehicle forms
+DEFAULT_HELPLINE = getattr(settings, 'PARKPING_HELPLINE_NUMBER', '+1-800-727-5746')
+
+CONTACT_INFO_CACHE_TIMEOUT = 300  # seconds
 
 
 class SubscriptionPlan(models.Model):
     """Model for subscription plans"""
     
-    PLAN_TYPES = [
-        ('free', 'Free'),
-        ('basic', 'Basic'),
-        ('pro', 'Professional'),
-        ('enterprise', 'Enterprise'),
-    ]
+    class PlanType(models.TextChoices):
+        FREE = 'free', 'Free'
+        BASIC = 'basic', 'Basic'
+        PRO = 'pro', 'Professional'
+        ENTERPRISE = 'enterprise', 'Enterprise'
+    
+    PLAN_TYPES = PlanType.choices
     
     name = models.CharField(max_length=100)
     plan_type = models.CharField(max_length=20, choices=PLAN_TYPES, unique=True)
@@ -43,12 +56,27 @@ class SubscriptionPlan(models.Model):
     
     class Meta:
         ordering = ['price']
+        indexes = [
+            models.Index(fields=['is_active', 'price']),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.plan_type}"
     
-    def get_features(self):
-        """Return a dictionary of plan features"""
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Drop the memoized features in case limits were edited
+        self.__dict__.pop('features', None)
+        invalidate_plan_caches()
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        invalidate_plan_caches()
+        return result
+    
+    @cached_property
+    def features(self):
+        """Dictionary of plan features, built once per instance"""
         return {
             'max_vehicles': self.max_vehicles,
             'max_phone_numbers': self.max_phone_numbers,
@@ -58,27 +86,44 @@ class SubscriptionPlan(models.Model):
             'priority_support': self.priority_support,
             'analytics_dashboard': self.analytics_dashboard,
         }
+    
+    def get_features(self):
+        """Return a dictionary of plan features"""
+        return self.features
+
+
+class VehicleQuerySet(models.QuerySet):
+    """QuerySet that keeps owners' denormalized counts in sync on bulk deletes"""
+    
+    def delete(self):
+        # Bulk deletes skip Vehicle.delete(), so recount the affected owners here
+        user_ids = set(self.values_list('user_id', flat=True))
+        result = super().delete()
+        Vehicle.sync_owners(user_ids)
+        return result
 
 
 class Vehicle(models.Model):
     """Model for user vehicles"""
     
-    VEHICLE_TYPES = [
-        ('car', 'Car'),
-        ('motorcycle', 'Motorcycle'),
-        ('truck', 'Truck'),
-        ('van', 'Van'),
-        ('suv', 'SUV'),
-        ('other', 'Other'),
-    ]
+    class VehicleType(models.TextChoices):
+        CAR = 'car', 'Car'
+        MOTORCYCLE = 'motorcycle', 'Motorcycle'
+        TRUCK = 'truck', 'Truck'
+        VAN = 'van', 'Van'
+        SUV = 'suv', 'SUV'
+        OTHER = 'other', 'Other'
+    
+    VEHICLE_TYPES = VehicleType.choices
     
-    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='vehicles')
-    vehicle_type = models.CharField(max_length=20, choices=VEHICLE_TYPES, default='car')
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='vehicles', db_index=False)  # Covered by (user, is_qr_active)
+    vehicle_type = models.CharField(max_length=20, choices=VEHICLE_TYPES, default=VehicleType.CAR)
     make = models.CharField(max_length=100)
     model = models.CharField(max_length=100)
     year = models.PositiveIntegerField()
     color = models.CharField(max_length=50)
     license_plate = models.CharField(max_length=20, unique=True)
+    license_plate_norm = models.CharField(max_length=20, db_index=True, editable=False, help_text="Uppercase alphanumeric plate for search")
     vin = models.CharField(max_length=17, blank=True, help_text="Vehicle Identification Number")
     
     # Contact information
@@ -92,7 +137,7 @@ class Vehicle(models.Model):
     
     # QR Code settings
     qr_code = models.ImageField(upload_to='qr_codes/', null=True, blank=True)
-    qr_unique_id = models.UUIDField(default=uuid.uuid4, unique=True)
+    qr_unique_id = models.UUIDField(default=uuid7, unique=True)
     is_qr_active = models.BooleanField(default=True)
     
     # QR Code customization settings
@@ -109,7 +154,7 @@ class Vehicle(models.Model):
     show_vehicle_details = models.BooleanField(default=True)
     
     # Emergency contact and helpline
-    emergency_contact_number = models.CharField(max_length=17, blank=True, help_text="Emergency contact number to display in QR code")
+    emergency_contact_number = models.CharField(max_length=17, blank=True, validators=[PHONE_VALIDATOR], help_text="Emergency contact number to display in QR code")
     show_emergency_contact = models.BooleanField(default=False, help_text="Show emergency contact number in QR code")
     helpline_number = models.CharField(max_length=17, blank=True, help_text="Helpline number to display in QR code")
     show_helpline_number = models.BooleanField(default=False, help_text="Show helpline number in QR code")
@@ -121,16 +166,81 @@ class Vehicle(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = VehicleQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'is_qr_active']),
+            # Trigram indexes for the admin's ILIKE '%...%' search (plain indexes outside PostgreSQL)
+            GinIndex(fields=['license_plate'], opclasses=['gin_trgm_ops'], name='parking_vehicle_plate_trgm'),
+            GinIndex(fields=['vin'], opclasses=['gin_trgm_ops'], name='parking_vehicle_vin_trgm'),
+        ]
+        constraints = [
+            # VINs are optional, so only non-empty values must be unique
+            models.UniqueConstraint(fields=['vin'], condition=~models.Q(vin=''), name='uniq_vehicle_vin'),
+        ]
     
     def __str__(self):
         return f"{self.year} {self.make} {self.model} - {self.license_plate}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded owner and QR state so save() only recounts when they change
+        instance._loaded_user_id = instance.__dict__.get('user_id')
+        instance._loaded_is_qr_active = instance.__dict__.get('is_qr_active')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        self.license_plate_norm = normalize_plate(self.license_plate)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'license_plate' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'license_plate_norm'}
+        super().save(*args, **kwargs)
+        # Invalidate the owner's cached dashboard fragments, recounting active QR codes only if they can have changed
+        loaded_user_id = getattr(self, '_loaded_user_id', None)
+        if loaded_user_id != self.user_id or getattr(self, '_loaded_is_qr_active', None) != self.is_qr_active:
+            self.sync_owners({self.user_id, loaded_user_id})
+        else:
+            CustomUser.touch(self.user_id)
+        self._loaded_user_id = self.user_id
+        self._loaded_is_qr_active = self.is_qr_active
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.sync_owners({self.user_id})
+        return result
+    
+    @classmethod
+    def sync_owners(cls, user_ids):
+        """Bump updated_at and recount active_qr_count for the given users in one UPDATE"""
+        active_count = cls.objects.filter(
+            user=models.OuterRef('pk'), is_qr_active=True
+        ).order_by().values('user').annotate(total=models.Count('pk')).values('total')
+        CustomUser.objects.filter(pk__in=[pk for pk in user_ids if pk is not None]).update(
+            updated_at=timezone.now(),
+            active_qr_count=Coalesce(models.Subquery(active_count), 0)
+        )
+    
+    @classmethod
+    def touch(cls, vehicle_id):
+        """Bump updated_at without loading or re-saving the vehicle row"""
+        cls.objects.filter(pk=vehicle_id).update(updated_at=timezone.now())
+    
     def get_contact_info(self):
+        """Return contact information, cached until the vehicle or its owner changes"""
+        key = f'vehicle_contact_info:{self.pk}:{self.updated_at.timestamp()}:{self.user.updated_at.timestamp()}'
+        info = cache.get(key)
+        if info is None:
+            info = self._build_contact_info()
+            cache.set(key, info, CONTACT_INFO_CACHE_TIMEOUT)
+        return info
+    
+    def _build_contact_info(self):
         """Return contact information based on visibility settings"""
         info = {}
-        if self.show_phone and self.contact_phone:
+        if self.show_phone and self.contact_phone_id:
             # If masking is enabled, don't show the actual phone number
             if self.masking_enabled:
                 info['phone'] = None  # Will be handled by masking API
@@ -155,10 +265,8 @@ class Vehicle(models.Model):
             info['emergency_contact'] = self.emergency_contact_number
         # Helpline number - always use default ParkPing helpline
         if self.show_helpline_number:
-            from django.conf import settings
-            default_helpline = getattr(settings, 'PARKPING_HELPLINE_NUMBER', '+1-800-727-5746')
-            if default_helpline:
-                info['helpline'] = default_helpline
+            if DEFAULT_HELPLINE:
+                info['helpline'] = DEFAULT_HELPLINE
                 info['helpline_is_default'] = True
         
         # Multiple contacts with relations
@@ -185,7 +293,7 @@ class VehicleContact(models.Model):
         ('other', 'Other'),
     ]
     
-    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='contacts')
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='contacts', db_index=False)  # Covered by unique_together
     phone_number = models.CharField(max_length=17, help_text="Contact phone number")
     relation = models.CharField(max_length=20, choices=RELATION_CHOICES, default='family', help_text="Relationship to vehicle owner")
     is_primary = models.BooleanField(default=False, help_text="Primary contact number")
@@ -200,12 +308,22 @@ class VehicleContact(models.Model):
     
     def __str__(self):
         return f"{self.vehicle.license_plate} - {self.phone_number} ({self.get_relation_display()})"
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Invalidate the vehicle's cached contact info
+        Vehicle.touch(self.vehicle_id)
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        Vehicle.touch(self.vehicle_id)
+        return result
 
 
 class QRCodeScan(models.Model):
     """Model to track QR code scans"""
     
-    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='scans')
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='scans', db_index=False)  # Covered by (vehicle, -scanned_at)
     scanned_by_ip = models.GenericIPAddressField(null=True, blank=True)
     scanned_by_user_agent = models.TextField(blank=True)
     scanned_at = models.DateTimeField(auto_now_add=True)
@@ -214,6 +332,9 @@ class QRCodeScan(models.Model):
     
     class Meta:
         ordering = ['-scanned_at']
+        indexes = [
+            models.Index(fields=['vehicle', '-scanned_at']),
+        ]
     
     def __str__(self):
         return f"Scan of {self.vehicle} at {self.scanned_at}"
@@ -222,16 +343,17 @@ class QRCodeScan(models.Model):
 class ParkingSession(models.Model):
     """Model to track parking sessions"""
     
-    STATUS_CHOICES = [
-        ('active', 'Active'),
-        ('completed', 'Completed'),
-        ('cancelled', 'Cancelled'),
-    ]
+    class Status(models.TextChoices):
+        ACTIVE = 'active', 'Active'
+        COMPLETED = 'completed', 'Completed'
+        CANCELLED = 'cancelled', 'Cancelled'
+    
+    STATUS_CHOICES = Status.choices
     
     vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='parking_sessions')
     start_time = models.DateTimeField(auto_now_add=True)
     end_time = models.DateTimeField(null=True, blank=True)
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=Status.ACTIVE)
     
     # Location information
     location_name = models.CharField(max_length=200, blank=True)
@@ -258,22 +380,31 @@ class ParkingSession(models.Model):
 class PhoneNumberMasking(models.Model):
     """Model to track phone number masking sessions"""
     
-    STATUS_CHOICES = [
-        ('active', 'Active'),
-        ('expired', 'Expired'),
-        ('cancelled', 'Cancelled'),
-    ]
+    class Status(models.TextChoices):
+        ACTIVE = 'active', 'Active'
+        EXPIRED = 'expired', 'Expired'
+        CANCELLED = 'cancelled', 'Cancelled'
+    
+    STATUS_CHOICES = Status.choices
+    
+    class CallStatus(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        INITIATED = 'initiated', 'Initiated'
+        FAILED = 'failed', 'Failed'
     
     # Core fields
-    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='masking_sessions')
+    vehicle = models.ForeignKey(Vehicle, on_delete=models.CASCADE, related_name='masking_sessions', db_index=False)  # Covered by (vehicle, status)
     original_phone = models.CharField(max_length=17, help_text="Original phone number being masked")
     masked_phone = models.CharField(max_length=17, help_text="Generated masked phone number or scanner number")
     scanner_phone = models.CharField(max_length=17, blank=True, null=True, help_text="Scanner's phone number (for Twilio connection)")
     
     # Session management
-    session_id = models.UUIDField(default=uuid.uuid4, unique=True, help_text="Unique session identifier")
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    session_id = models.UUIDField(default=uuid7, unique=True, help_text="Unique session identifier")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=Status.ACTIVE)
     twilio_call_sid = models.CharField(max_length=50, blank=True, null=True, help_text="Twilio Call SID for tracking")
+    call_status = models.CharField(max_length=20, choices=CallStatus.choices, blank=True, help_text="Outcome of the latest dispatched call")
+    call_error = models.CharField(max_length=255, blank=True, help_text="Error from the latest failed call")
+    call_queued_at = models.DateTimeField(null=True, blank=True, help_text="When the latest call was queued")
     
     # Timing
     created_at = models.DateTimeField(auto_now_add=True)
@@ -287,40 +418,55 @@ class PhoneNumberMasking(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['vehicle', 'status']),
-            models.Index(fields=['masked_phone']),
-            models.Index(fields=['expires_at']),
+            models.Index(fields=['masked_phone', 'status']),
+            models.Index(fields=['status', 'expires_at']),
         ]
     
     def __str__(self):
-        return f"{self.vehicle.license_plate} - {self.masked_phone} ({self.status})"
-    
-    def is_active(self):
-        """Check if masking session is currently active"""
-        from django.utils import timezone
-        now = timezone.now()
-        return self.status == 'active' and now <= self.expires_at
+        # Use the plate only when the vehicle is already loaded, so a repr never queries
+        if PhoneNumberMasking.vehicle.is_cached(self):
+            label = self.vehicle.license_plate
+        else:
+            label = f"Vehicle #{self.vehicle_id}"
+        return f"{label} - {self.masked_phone} ({self.status})"
+    
+    @cached_property
+    def is_currently_active(self):
+        """Whether the masking session is active, evaluated once per instance"""
+        return self.is_active(timezone.now())
+    
+    def is_active(self, now=None):
+        """Check if masking session is active; pass now when checking many sessions"""
+        if now is None:
+            return self.is_currently_active
+        return self.status == self.Status.ACTIVE and now <= self.expires_at
     
     def increment_call_count(self):
         """Increment call count and update last called timestamp"""
-        from django.utils import timezone
+        now = timezone.now()
+        # Increment in the database so concurrent calls are not lost
+        PhoneNumberMasking.objects.filter(pk=self.pk).update(
+            call_count=models.F('call_count') + 1,
+            last_called_at=now
+        )
         self.call_count += 1
-        self.last_called_at = timezone.now()
-        self.save(update_fields=['call_count', 'last_called_at'])
+        self.last_called_at = now
 
 
 class UserSubscription(models.Model):
     """Model to track user subscription history"""
     
-    STATUS_CHOICES = [
-        ('active', 'Active'),
-        ('expired', 'Expired'),
-        ('cancelled', 'Cancelled'),
-        ('pending', 'Pending'),
-    ]
+    class Status(models.TextChoices):
+        ACTIVE = 'active', 'Active'
+        EXPIRED = 'expired', 'Expired'
+        CANCELLED = 'cancelled', 'Cancelled'
+        PENDING = 'pending', 'Pending'
+    
+    STATUS_CHOICES = Status.choices
     
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='subscriptions')
     plan = models.ForeignKey(SubscriptionPlan, on_delete=models.CASCADE)
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=Status.PENDING)
     
     # Billing information
     start_date = models.DateTimeField()
@@ -339,8 +485,13 @@ class UserSubscription(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.plan.name} ({self.status})"
     
-    def is_active(self):
-        """Check if subscription is currently active"""
-        from django.utils import timezone
-        now = timezone.now()
-        return self.status == 'active' and self.start_date <= now <= self.end_date
+    @cached_property
+    def is_currently_active(self):
+        """Whether the subscription is active, evaluated once per instance"""
+        return self.is_active(timezone.now())
+    
+    def is_active(self, now=None):
+        """Check if subscription is active; pass now when checking many subscriptions"""
+        if now is None:
+            return self.is_currently_active
+        return self.status == self.Status.ACTIVE and self.start_date <= now <= self.end_date
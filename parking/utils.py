@@ -1,10 +1,134 @@
 """
 Utility functions for parking app
 """
+import os
+import re
+import time
+import uuid
+
 from django.contrib import messages
+from django.core.cache import cache
 from django.shortcuts import redirect
 
 
+ACTIVE_PLANS_CACHE_KEY = 'parking:active_plans'
+ACTIVE_PLANS_CACHE_TIMEOUT = 300  # seconds
+PLAN_LOOKUPS_CACHE_KEY = 'parking:plan_lookups'
+PLAN_LOOKUPS_CACHE_TIMEOUT = 600  # seconds
+PLAN_USAGE_CACHE_TIMEOUT = 300  # seconds
+SCAN_COUNT_CACHE_TIMEOUT = 60  # seconds
+
+NON_ALNUM_RE = re.compile(r'[^0-9A-Z]')
+
+
+def uuid7():
+    """
+    Generate a time-ordered (version 7) UUID
+    
+    The leading 48 bits are the Unix time in milliseconds, so new rows land at
+    the end of the unique index instead of on random pages.
+    
+    Returns:
+        uuid.UUID: A UUID with 74 random bits after the timestamp
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def normalize_plate(value):
+    """
+    Normalize a license plate for indexed lookups
+    
+    Args:
+        value: License plate or search text as typed
+        
+    Returns:
+        str: Uppercase plate with spaces, dashes and other separators removed
+    """
+    return NON_ALNUM_RE.sub('', value.upper())
+
+
+def get_active_plans():
+    """
+    Get active subscription plans ordered by price, cached for a short time
+    
+    Returns:
+        list: SubscriptionPlan objects
+    """
+    plans = cache.get(ACTIVE_PLANS_CACHE_KEY)
+    if plans is None:
+        from .models import SubscriptionPlan
+        plans = list(SubscriptionPlan.objects.filter(is_active=True).order_by('price'))
+        cache.set(ACTIVE_PLANS_CACHE_KEY, plans, ACTIVE_PLANS_CACHE_TIMEOUT)
+    return plans
+
+
+def get_plan_lookups():
+    """
+    Get (id, name) pairs for every subscription plan, cached for admin filters
+    
+    Returns:
+        list: (id, name) tuples ordered by price
+    """
+    def fetch():
+        from .models import SubscriptionPlan
+        return list(SubscriptionPlan.objects.values_list('id', 'name'))
+    return cache.get_or_set(PLAN_LOOKUPS_CACHE_KEY, fetch, PLAN_LOOKUPS_CACHE_TIMEOUT)
+
+
+def invalidate_plan_caches():
+    """Drop cached plan data after plans change"""
+    cache.delete_many([ACTIVE_PLANS_CACHE_KEY, PLAN_LOOKUPS_CACHE_KEY])
+
+
+def get_plan_usage_count(user, limit_type):
+    """
+    Get how many vehicles or phone numbers a user has, cached per user version
+    
+    Vehicle and UserPhoneNumber writes bump user.updated_at, which is part of
+    the cache key, so a count is never served after the rows change.
+    
+    Args:
+        user: User object
+        limit_type: Type of limit to count ('vehicles', 'phone_numbers')
+        
+    Returns:
+        int: Current number of rows for the limit type
+    """
+    def fetch():
+        if limit_type == 'vehicles':
+            from .models import Vehicle
+            return Vehicle.objects.filter(user=user).count()
+        from accounts.models import UserPhoneNumber
+        return UserPhoneNumber.objects.filter(user=user).count()
+    
+    cache_key = f'plan_usage:{user.pk}:{limit_type}:{user.updated_at.timestamp()}'
+    return cache.get_or_set(cache_key, fetch, PLAN_USAGE_CACHE_TIMEOUT)
+
+
+def get_total_scan_count(user):
+    """
+    Get the number of times the user's QR codes have been scanned, cached for a short time
+    
+    Scans are written in the background and never touch the user row, so the
+    count is refreshed by timeout instead of by version.
+    
+    Args:
+        user: User object
+        
+    Returns:
+        int: Total scans across all of the user's vehicles
+    """
+    def fetch():
+        from .models import QRCodeScan
+        return QRCodeScan.objects.filter(vehicle__user=user).count()
+    
+    return cache.get_or_set(f'scan_count:{user.pk}', fetch, SCAN_COUNT_CACHE_TIMEOUT)
+
+
 def check_plan_limit(user, limit_type, current_count=None, redirect_url=None):
     """
     Check if user has reached their plan limit for a specific feature
@@ -26,17 +150,14 @@ def check_plan_limit(user, limit_type, current_count=None, redirect_url=None):
     # Get the appropriate limit based on limit_type
     if limit_type == 'vehicles':
         max_allowed = user_plan.max_vehicles
-        if current_count is None:
-            from .models import Vehicle
-            current_count = Vehicle.objects.filter(user=user).count()
     elif limit_type == 'phone_numbers':
         max_allowed = user_plan.max_phone_numbers
-        if current_count is None:
-            from accounts.models import UserPhoneNumber
-            current_count = UserPhoneNumber.objects.filter(user=user).count()
     else:
         return False, f"Unknown limit type: {limit_type}", 0, 0
     
+    if current_count is None:
+        current_count = get_plan_usage_count(user, limit_type)
+    
     can_add = current_count < max_allowed
     
     if not can_add:
@@ -1,47 +1,132 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, Http404
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, Q
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.paginator import Paginator
+from django.urls import reverse
+from datetime import timedelta
 import qrcode
+from functools import lru_cache
 from io import BytesIO
+from PIL import ImageDraw, ImageFont, ImageOps
+import hashlib
 import json
+import re
 
 from .models import (
     Vehicle, SubscriptionPlan, ParkingSession, 
-    QRCodeScan, UserSubscription, VehicleContact
+    QRCodeScan, UserSubscription, VehicleContact, PhoneNumberMasking
 )
 from .forms import (
     VehicleForm, ParkingSessionForm, QRCodeCustomizationForm,
     SubscriptionPlanSelectionForm, VehicleSearchForm, ContactOwnerForm
 )
+from .utils import get_active_plans, get_plan_usage_count, normalize_plate
+from .masking_service import MockMaskingService
 from accounts.models import CustomUser, UserPhoneNumber
 from django.conf import settings
 
+try:
+    import orjson
+except ImportError:
+    # orjson not installed, fall back to Django's JSON encoder
+    orjson = None
+
+try:
+    from .call_service import CallService
+except ImportError:
+    # requests not installed, click-to-call is unavailable
+    CallService = None
+
+try:
+    from groq import Groq
+except ImportError:
+    # groq not installed, the chatbot is unavailable
+    Groq = None
+
+# Repeat scans of the same QR code from one address within this window are recorded once
+SCAN_DEDUPE_SECONDS = 60
+
+# Rendered QR images are keyed by their content fingerprint, so they never go stale
+QR_PNG_CACHE_TIMEOUT = 30 * 24 * 60 * 60
+
+# Templates version QR image URLs with the vehicle's updated_at, so they can be cached long
+QR_IMAGE_MAX_AGE = 30 * 24 * 60 * 60
+
+# Any mask is valid to scanners; a fixed one avoids trying every mask per render
+QR_MASK_PATTERN = 0
+
+QR_LOGO_FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+PARKING_SESSIONS_PER_PAGE = 50
+
+# A dispatched call still queued after this long was dropped (e.g. its worker was recycled)
+CALL_QUEUED_STALE_SECONDS = 45
+
+# A QR code id, bare or inside a scanned QR URL
+QR_ID_RE = re.compile(r'[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}', re.IGNORECASE)
+
+# Shorter plate searches only match exactly, so they can't return most of the table
+PLATE_PREFIX_MIN_LENGTH = 3
+
+# Columns read by the public scan page, including everything Vehicle.get_contact_info needs
+SCAN_VEHICLE_FIELDS = (
+    'qr_unique_id', 'make', 'model', 'year', 'color', 'license_plate',
+    'show_phone', 'show_name', 'show_email', 'show_vehicle_details',
+    'emergency_contact_number', 'show_emergency_contact', 'show_helpline_number',
+    'masking_enabled', 'updated_at', 'contact_phone__phone_number',
+    'user__username', 'user__first_name', 'user__last_name', 'user__email', 'user__updated_at',
+)
+
+
+def json_response(data, status=200):
+    """Return a JSON response, encoded with orjson when it is installed"""
+    if orjson is None:
+        return JsonResponse(data, status=status)
+    return HttpResponse(orjson.dumps(data), content_type='application/json', status=status)
+
+
+def json_body(request):
+    """Parse a request's JSON body, with orjson when it is installed"""
+    if orjson is None:
+        return json.loads(request.body)
+    return orjson.loads(request.body)
+
+
+def list_vehicles_with_recent_scans(user):
+    """Fetch the user's vehicles, each annotated with its scan count for the last 7 days"""
+    week_ago = timezone.now() - timezone.timedelta(days=7)
+    return list(Vehicle.objects.filter(user=user).annotate(
+        recent_scan_count=Count('scans', filter=Q(scans__scanned_at__gte=week_ago))
+    ))
+
 
 @login_required
 def vehicle_list(request):
     """View for listing user's vehicles"""
-    vehicles = Vehicle.objects.filter(user=request.user)
+    # The template lists every vehicle anyway, so take every stat from the fetched rows
+    vehicles = list_vehicles_with_recent_scans(request.user)
+    vehicle_count = len(vehicles)
     
     # Check subscription limits
     user_plan = request.user.current_plan
     max_vehicles = user_plan.max_vehicles if user_plan else 1
     
     # Calculate stats
-    active_qr_count = vehicles.filter(is_qr_active=True).count()
-    recent_scans = QRCodeScan.objects.filter(
-        vehicle__user=request.user,
-        scanned_at__gte=timezone.now() - timezone.timedelta(days=7)
-    ).count()
+    active_qr_count = sum(1 for vehicle in vehicles if vehicle.is_qr_active)
+    recent_scans = sum(vehicle.recent_scan_count for vehicle in vehicles)
     
     context = {
         'vehicles': vehicles,
         'max_vehicles': max_vehicles,
-        'can_add_vehicle': vehicles.count() < max_vehicles,
+        'vehicle_count': vehicle_count,
+        'can_add_vehicle': vehicle_count < max_vehicles,
         'active_qr_count': active_qr_count,
         'recent_scans': recent_scans,
     }
@@ -51,17 +136,16 @@ def vehicle_list(request):
 @login_required
 def qr_codes(request):
     """View for managing QR codes"""
-    vehicles = Vehicle.objects.filter(user=request.user)
+    # The template lists every vehicle anyway, so take every stat from the fetched rows
+    vehicles = list_vehicles_with_recent_scans(request.user)
     
     # Calculate stats
-    active_qr_count = vehicles.filter(is_qr_active=True).count()
-    recent_scans = QRCodeScan.objects.filter(
-        vehicle__user=request.user,
-        scanned_at__gte=timezone.now() - timezone.timedelta(days=7)
-    ).count()
+    active_qr_count = sum(1 for vehicle in vehicles if vehicle.is_qr_active)
+    recent_scans = sum(vehicle.recent_scan_count for vehicle in vehicles)
     
     context = {
         'vehicles': vehicles,
+        'vehicle_count': len(vehicles),
         'active_qr_count': active_qr_count,
         'recent_scans': recent_scans,
     }
@@ -74,7 +158,7 @@ def add_vehicle(request):
     # Check subscription limits
     user_plan = request.user.current_plan
     max_vehicles = user_plan.max_vehicles if user_plan else 1
-    current_count = Vehicle.objects.filter(user=request.user).count()
+    current_count = get_plan_usage_count(request.user, 'vehicles')
     
     if current_count >= max_vehicles:
         messages.error(request, f'You have reached the maximum number of vehicles ({max_vehicles}) for your plan.')
@@ -99,10 +183,9 @@ def add_vehicle(request):
                     'user_plan': user_plan,
                     'max_vehicles': max_vehicles,
                     'can_add_vehicle': current_count < max_vehicles,
+                    'current_count': current_count,
                     'user_phone_numbers': user_phone_numbers,
-                    'phone_numbers': user_phone_numbers,
-                    'vehicles': Vehicle.objects.filter(user=request.user),
-                    'active_qr_count': Vehicle.objects.filter(user=request.user, is_qr_active=True).count(),
+                    'active_qr_count': request.user.active_qr_count,
                 }
                 return render(request, 'parking/add_vehicle.html', context)
             
@@ -135,7 +218,7 @@ def add_vehicle(request):
             
             # Set as contact_phone for the vehicle (required for masking)
             vehicle.contact_phone = user_phone
-            vehicle.save()
+            vehicle.save(update_fields=['contact_phone', 'updated_at'])
             
             # Save additional contacts (optional)
             contact_count = 1  # Start from 1, since 0 is primary
@@ -177,19 +260,12 @@ def add_vehicle(request):
     else:
         form = VehicleForm(user=request.user)
     
-    # Calculate stats
-    vehicles = Vehicle.objects.filter(user=request.user)
-    active_qr_count = vehicles.filter(is_qr_active=True).count()
-    phone_numbers = UserPhoneNumber.objects.filter(user=request.user)
-    
     context = {
         'form': form,
         'max_vehicles': max_vehicles,
         'current_count': current_count,
         'user_phone_numbers': user_phone_numbers,
-        'phone_numbers': phone_numbers,
-        'vehicles': vehicles,
-        'active_qr_count': active_qr_count,
+        'active_qr_count': request.user.active_qr_count,
     }
     return render(request, 'parking/add_vehicle.html', context)
 
@@ -254,7 +330,7 @@ def edit_vehicle(request, pk):
             
             # Set as contact_phone for the vehicle (required for masking)
             vehicle.contact_phone = user_phone
-            vehicle.save()
+            vehicle.save(update_fields=['contact_phone', 'updated_at'])
             
             # Save additional contacts (optional)
             contact_count = 1  # Start from 1, since 0 is primary
@@ -321,18 +397,21 @@ def vehicle_detail(request, pk):
     """View for vehicle details and QR code"""
     vehicle = get_object_or_404(Vehicle, pk=pk, user=request.user)
     
-    # Get QR code scans
-    scans = QRCodeScan.objects.filter(vehicle=vehicle).order_by('-scanned_at')[:10]
+    # Get QR code scans and the scan total shown in the template
+    vehicle_scans = QRCodeScan.objects.filter(vehicle=vehicle)
+    scans = list(vehicle_scans.order_by('-scanned_at')[:10])
+    total_scans = vehicle_scans.count()
     
     # Get active parking sessions
-    active_sessions = ParkingSession.objects.filter(
+    active_sessions = list(ParkingSession.objects.filter(
         vehicle=vehicle, 
         status='active'
-    ).order_by('-start_time')
+    ).order_by('-start_time'))
     
     context = {
         'vehicle': vehicle,
         'scans': scans,
+        'total_scans': total_scans,
         'active_sessions': active_sessions,
     }
     return render(request, 'parking/vehicle_detail.html', context)
@@ -359,47 +438,86 @@ def toggle_qr_code(request, pk):
     
     # Toggle QR code status
     vehicle.is_qr_active = not vehicle.is_qr_active
-    vehicle.save()
+    vehicle.save(update_fields=['is_qr_active', 'updated_at'])
     
     status = 'activated' if vehicle.is_qr_active else 'deactivated'
     messages.success(request, f'QR code {status} successfully!')
     return redirect('parking:vehicle_detail', pk=pk)
 
 
-def generate_qr_code(vehicle, request=None, custom_settings=None):
-    """Generate QR code for a vehicle with optional customization"""
-    from django.urls import reverse
-    from django.conf import settings
+@lru_cache(maxsize=None)
+def load_logo_font(font_size):
+    """Load the branding font once per size, falling back to PIL's default font"""
+    try:
+        # Try to use a system font - make it bigger
+        return ImageFont.truetype(QR_LOGO_FONT_PATH, font_size)
+    except Exception:
+        try:
+            # Fallback font
+            return ImageFont.load_default()
+        except Exception:
+            return None
+
+
+def draw_branding(img, logo_size, primary_rgb, secondary_rgb):
+    """Draw the PARKPING label straight onto the center of an RGB QR image"""
+    width, height = img.size
     
-    # Create QR code URL that leads to the contact page
-    qr_url = reverse('parking:scan_qr_code', kwargs={'qr_id': vehicle.qr_unique_id})
+    # Create center branding area
+    center_x, center_y = width // 2, height // 2
     
-    # Try to build a full URL with domain
-    if request:
-        # Use the request to build the full URL
-        qr_data = request.build_absolute_uri(qr_url)
-    elif hasattr(settings, 'SITE_URL') and settings.SITE_URL:
-        # Use configured site URL
-        qr_data = f"{settings.SITE_URL.rstrip('/')}{qr_url}"
-    else:
-        # Fall back to relative URL for development
-        # In production, you should set SITE_URL in settings
-        qr_data = f"http://127.0.0.1:8000{qr_url}"
+    # Set logo size based on settings
+    logo_size_mapping = {
+        'small': min(width, height) // 8,
+        'medium': min(width, height) // 6,
+        'large': min(width, height) // 4
+    }
+    logo_size = logo_size_mapping.get(logo_size, logo_size_mapping['medium'])
     
-    # Get customization settings from vehicle or custom_settings parameter
-    if custom_settings:
-        primary_color = custom_settings.get('primary_color', vehicle.qr_primary_color)
-        secondary_color = custom_settings.get('secondary_color', vehicle.qr_secondary_color)
-        include_logo = custom_settings.get('include_logo', vehicle.qr_include_logo)
-        logo_size = custom_settings.get('logo_size', vehicle.qr_logo_size)
-        qr_size = custom_settings.get('qr_size', vehicle.qr_size)
-    else:
-        primary_color = vehicle.qr_primary_color
-        secondary_color = vehicle.qr_secondary_color
-        include_logo = vehicle.qr_include_logo
-        logo_size = vehicle.qr_logo_size
-        qr_size = vehicle.qr_size
+    draw = ImageDraw.Draw(img)
+    
+    # Bigger text than logo_size // 3
+    font = load_logo_font(logo_size // 2)
     
+    # Draw PARKPING text with background
+    text = "PARKPING"
+    if font:
+        # Get text dimensions
+        bbox = draw.textbbox((0, 0), text, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+        
+        # Position text in center
+        text_x = center_x - text_width // 2
+        text_y = center_y - text_height // 2
+        
+        # Draw background rectangle for text - adjust for better centering
+        padding = 6  # Increased padding for bigger text
+        vertical_padding = 3  # Extra vertical padding to center text better
+        draw.rectangle([
+            text_x - padding, text_y - vertical_padding,
+            text_x + text_width + padding, text_y + text_height + padding + 14
+        ], fill=secondary_rgb)  # Use secondary color as background
+        
+        # Draw text
+        draw.text((text_x, text_y), text, fill=primary_rgb, font=font)
+    else:
+        # Fallback: draw simple text without font with background
+        text_x = center_x - 40  # Adjusted for bigger text area
+        text_y = center_y - 6   # Adjusted for better vertical centering
+        
+        # Draw background rectangle - bigger for larger text with better centering
+        draw.rectangle([
+            text_x - 6, text_y - 8,  # Extra top padding
+            text_x + 80, text_y + 18  # Balanced bottom padding
+        ], fill=secondary_rgb)  # Use secondary color as background
+        
+        # Draw text
+        draw.text((text_x, text_y), text, fill=primary_rgb)
+
+
+def render_qr_png(qr_data, primary_color, secondary_color, include_logo, logo_size, qr_size):
+    """Render a styled QR code and return the PNG bytes"""
     # Convert hex colors to RGB tuples for PIL compatibility
     def hex_to_rgb(hex_color):
         hex_color = hex_color.lstrip('#')
@@ -423,6 +541,7 @@ def generate_qr_code(vehicle, request=None, custom_settings=None):
         error_correction=qrcode.constants.ERROR_CORRECT_M,  # Better error correction
         box_size=qr_config['box_size'],
         border=qr_config['border'],
+        mask_pattern=QR_MASK_PATTERN,  # Skip scoring all eight masks in pure Python
     )
     qr.add_data(qr_data)
     qr.make(fit=True)
@@ -430,17 +549,14 @@ def generate_qr_code(vehicle, request=None, custom_settings=None):
     try:
         from qrcode.image.styledpil import StyledPilImage
         from qrcode.image.styles.moduledrawers import RoundedModuleDrawer
-        from qrcode.image.styles.colormasks import SolidFillColorMask
         
-        # Create styled QR code with rounded corners
+        # Create styled QR code with rounded corners, drawn black on white
         img = qr.make_image(
             image_factory=StyledPilImage,
-            module_drawer=RoundedModuleDrawer(),
-            color_mask=SolidFillColorMask(
-                back_color=secondary_rgb,
-                front_color=primary_rgb
-            )
+            module_drawer=RoundedModuleDrawer()
         )
+        # Recolor with a per-channel lookup table; qrcode's color masks walk every pixel in Python
+        img = ImageOps.colorize(img.get_image().convert('L'), black=primary_rgb, white=secondary_rgb)
     except (ImportError, Exception):
         # Fallback to basic styled QR code if advanced styling isn't available
         img = qr.make_image(
@@ -451,92 +567,110 @@ def generate_qr_code(vehicle, request=None, custom_settings=None):
     # Add PARKPING branding in the center of QR code (if enabled)
     if include_logo:
         try:
-            from PIL import Image, ImageDraw, ImageFont
-            import os
-            
-            # Convert to PIL Image for editing
-            img = img.convert('RGBA')
-            width, height = img.size
-            
-            # Create center branding area
-            center_x, center_y = width // 2, height // 2
-            
-            # Set logo size based on settings
-            logo_size_mapping = {
-                'small': min(width, height) // 8,
-                'medium': min(width, height) // 6,
-                'large': min(width, height) // 4
-            }
-            logo_size = logo_size_mapping.get(logo_size, logo_size_mapping['medium'])
-            
-            # Create overlay for the center logo
-            overlay = Image.new('RGBA', (width, height), (255, 255, 255, 0))
-            draw = ImageDraw.Draw(overlay)
-            
-            # Try to load a font for the text
-            try:
-                # Try to use a system font - make it bigger
-                font_size = logo_size // 2  # Increased from logo_size // 3
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-            except:
-                try:
-                    # Fallback font
-                    font = ImageFont.load_default()
-                except:
-                    font = None
-            
-            # Draw PARKPING text with background
-            text = "PARKPING"
-            if font:
-                # Get text dimensions
-                bbox = draw.textbbox((0, 0), text, font=font)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
-                
-                # Position text in center
-                text_x = center_x - text_width // 2
-                text_y = center_y - text_height // 2
-                
-                # Draw background rectangle for text - adjust for better centering
-                padding = 6  # Increased padding for bigger text
-                vertical_padding = 3  # Extra vertical padding to center text better
-                draw.rectangle([
-                    text_x - padding, text_y - vertical_padding,
-                    text_x + text_width + padding, text_y + text_height + padding + 14
-                ], fill=secondary_rgb + (255,))  # Use secondary color as background
-                
-                # Draw text
-                draw.text((text_x, text_y), text, fill=primary_rgb, font=font)
-            else:
-                # Fallback: draw simple text without font with background
-                text_x = center_x - 40  # Adjusted for bigger text area
-                text_y = center_y - 6   # Adjusted for better vertical centering
-                
-                # Draw background rectangle - bigger for larger text with better centering
-                draw.rectangle([
-                    text_x - 6, text_y - 8,  # Extra top padding
-                    text_x + 80, text_y + 18  # Balanced bottom padding
-                ], fill=secondary_rgb + (255,))  # Use secondary color as background
-                
-                # Draw text
-                draw.text((text_x, text_y), "PARKPING", fill=primary_rgb)
-            
-            # Composite the overlay onto the QR code
-            img = Image.alpha_composite(img, overlay)
-            img = img.convert('RGB')  # Convert back to RGB for saving
-            
-        except (ImportError, Exception) as e:
+            # The label is opaque, so it is drawn in place rather than composited from an overlay
+            if hasattr(img, 'get_image'):
+                img = img.get_image()
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            draw_branding(img, logo_size, primary_rgb, secondary_rgb)
+        except Exception:
             # If PIL operations fail, continue with the original QR code
             pass
     
-    # Save to BytesIO
     buffer = BytesIO()
     img.save(buffer, format='PNG')
-    buffer.seek(0)
+    return buffer.getvalue()
+
+
+def get_qr_render_args(vehicle, request=None, custom_settings=None):
+    """Return the QR payload, style and content fingerprint for a vehicle"""
+    # Create QR code URL that leads to the contact page
+    qr_url = reverse('parking:scan_qr_code', kwargs={'qr_id': vehicle.qr_unique_id})
     
-    # Save to vehicle
-    from django.core.files import File
-    vehicle.qr_code.save(f'qr_{vehicle.qr_unique_id}.png', File(buffer), save=True)
+    # Try to build a full URL with domain
+    if request:
+        # Use the request to build the full URL
+        qr_data = request.build_absolute_uri(qr_url)
+    elif hasattr(settings, 'SITE_URL') and settings.SITE_URL:
+        # Use configured site URL
+        qr_data = f"{settings.SITE_URL.rstrip('/')}{qr_url}"
+    else:
+        # Fall back to relative URL for development
+        # In production, you should set SITE_URL in settings
+        qr_data = f"http://127.0.0.1:8000{qr_url}"
+    
+    # Get customization settings from vehicle or custom_settings parameter
+    if custom_settings:
+        primary_color = custom_settings.get('primary_color', vehicle.qr_primary_color)
+        secondary_color = custom_settings.get('secondary_color', vehicle.qr_secondary_color)
+        include_logo = custom_settings.get('include_logo', vehicle.qr_include_logo)
+        logo_size = custom_settings.get('logo_size', vehicle.qr_logo_size)
+        qr_size = custom_settings.get('qr_size', vehicle.qr_size)
+    else:
+        primary_color = vehicle.qr_primary_color
+        secondary_color = vehicle.qr_secondary_color
+        include_logo = vehicle.qr_include_logo
+        logo_size = vehicle.qr_logo_size
+        qr_size = vehicle.qr_size
+    
+    # Fingerprint everything the image is drawn from, so an unchanged QR code
+    # is never re-rendered and each stored URL always serves the same bytes
+    fingerprint = hashlib.sha1(
+        f'{qr_data}|{primary_color}|{secondary_color}|{include_logo}|{logo_size}|{qr_size}'.encode()
+    ).hexdigest()[:12]
+    style = (primary_color, secondary_color, include_logo, logo_size, qr_size)
+    return qr_data, style, fingerprint
+
+
+def get_qr_png(qr_data, style, fingerprint):
+    """Return the PNG bytes for a QR code, reusing a cached render when possible"""
+    cache_key = f'qr_png:{fingerprint}'
+    png = cache.get(cache_key)
+    if png is None:
+        png = render_qr_png(qr_data, *style)
+        cache.set(cache_key, png, QR_PNG_CACHE_TIMEOUT)
+    return png
+
+
+def generate_qr_code(vehicle, request=None, custom_settings=None):
+    """Generate QR code for a vehicle with optional customization"""
+    qr_data, style, fingerprint = get_qr_render_args(vehicle, request, custom_settings)
+    filename = f'qr_{vehicle.qr_unique_id}_{fingerprint}.png'
+    current = vehicle.qr_code
+    if current and current.name == current.field.generate_filename(vehicle, filename) and current.storage.exists(current.name):
+        return
+    
+    png = get_qr_png(qr_data, style, fingerprint)
+    
+    # Save to vehicle, writing only the image column, then drop the superseded file
+    previous_name = vehicle.qr_code.name
+    vehicle.qr_code.save(filename, ContentFile(png), save=False)
+    vehicle.save(update_fields=['qr_code', 'updated_at'])
+    if previous_name and previous_name != vehicle.qr_code.name:
+        vehicle.qr_code.storage.delete(previous_name)
+
+
+def qr_code_image(request, qr_id):
+    """Serve a vehicle's QR code PNG with cache validators"""
+    vehicle = get_object_or_404(
+        Vehicle.objects.only(
+            'qr_unique_id', 'qr_primary_color', 'qr_secondary_color',
+            'qr_include_logo', 'qr_logo_size', 'qr_size'
+        ),
+        qr_unique_id=qr_id
+    )
+    # Publicly cacheable, so the payload must come from SITE_URL, never the request's Host header
+    qr_data, style, fingerprint = get_qr_render_args(vehicle)
+    
+    # The fingerprint changes with any restyle, so it doubles as the ETag
+    etag = f'"{fingerprint}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponse(status=304)
+    else:
+        response = HttpResponse(get_qr_png(qr_data, style, fingerprint), content_type='image/png')
+    response['ETag'] = etag
+    response['Cache-Control'] = f'public, max-age={QR_IMAGE_MAX_AGE}'
+    return response
 
 
 @login_required
@@ -559,7 +693,10 @@ def customize_qr(request, pk):
             vehicle.qr_include_logo = form.cleaned_data['include_logo']
             vehicle.qr_logo_size = form.cleaned_data['logo_size']
             vehicle.qr_size = form.cleaned_data['qr_size']
-            vehicle.save()
+            vehicle.save(update_fields=[
+                'qr_primary_color', 'qr_secondary_color', 'qr_include_logo',
+                'qr_logo_size', 'qr_size', 'updated_at',
+            ])
             
             # Regenerate QR code with new settings
             try:
@@ -589,7 +726,7 @@ def customize_qr(request, pk):
 @login_required
 def subscription_plans(request):
     """View for subscription plans"""
-    plans = SubscriptionPlan.objects.filter(is_active=True).order_by('price')
+    plans = get_active_plans()
     
     context = {
         'plans': plans,
@@ -601,15 +738,14 @@ def subscription_plans(request):
 @login_required
 def select_plan(request, plan_id):
     """View for selecting a subscription plan"""
-    plan = get_object_or_404(SubscriptionPlan, pk=plan_id, is_active=True)
+    # Resolve the plan from the cached active plan list instead of querying
+    plan = next((p for p in get_active_plans() if p.pk == plan_id), None)
+    if plan is None:
+        raise Http404("No active subscription plan matches the given query.")
     
     if request.method == 'POST':
         form = SubscriptionPlanSelectionForm(request.POST)
         if form.is_valid():
-            # Assign the plan to the user
-            from django.utils import timezone
-            from datetime import timedelta
-            
             # Get billing cycle from form
             billing_cycle = form.cleaned_data.get('billing_cycle', 'monthly')
             
@@ -633,7 +769,10 @@ def select_plan(request, plan_id):
                 request.user.subscription_end_date = None
                 success_message = f'Successfully activated {plan.name}! Your plan is now active.'
                 
-            request.user.save()
+            request.user.save(update_fields=[
+                'current_plan', 'subscription_start_date', 'subscription_end_date',
+                'is_subscription_active', 'updated_at',
+            ])
             
             messages.success(request, success_message)
             return redirect('parking:subscription_plans')
@@ -655,10 +794,18 @@ def select_plan(request, plan_id):
 @login_required
 def parking_sessions(request):
     """View for parking sessions"""
-    sessions = ParkingSession.objects.filter(vehicle__user=request.user).order_by('-start_time')
+    sessions = ParkingSession.objects.filter(vehicle__user=request.user)
+    
+    # Load one page of rows at a time; the paginator's count doubles as the total
+    page = Paginator(
+        sessions.select_related('vehicle').order_by('-start_time'),
+        PARKING_SESSIONS_PER_PAGE
+    ).get_page(request.GET.get('page'))
     
     context = {
-        'sessions': sessions,
+        'sessions': page,
+        'total_sessions': page.paginator.count,
+        'active_sessions': sessions.filter(status=ParkingSession.Status.ACTIVE).count(),
     }
     return render(request, 'parking/parking_sessions.html', context)
 
@@ -697,7 +844,7 @@ def end_parking_session(request, session_id):
     if session.status == 'active':
         session.status = 'completed'
         session.end_time = timezone.now()
-        session.save()
+        session.save(update_fields=['status', 'end_time'])
         messages.success(request, 'Parking session ended!')
     else:
         messages.error(request, 'This parking session is already completed.')
@@ -707,40 +854,46 @@ def end_parking_session(request, session_id):
 
 def scan_qr_code(request, qr_id):
     """Public view for scanning QR codes"""
-    try:
-        vehicle = Vehicle.objects.get(qr_unique_id=qr_id, is_qr_active=True)
-        
-        # Record the scan
+    # Load only the columns the scan page and get_contact_info read, plus the joined owner and contact phone
+    vehicle = (
+        Vehicle.objects
+        .select_related('user', 'contact_phone')
+        .only(*SCAN_VEHICLE_FIELDS)
+        .filter(qr_unique_id=qr_id, is_qr_active=True)
+        .first()
+    )
+    if vehicle is None:
+        messages.error(request, 'Invalid or inactive QR code.')
+        return redirect('home')
+    
+    # Record the scan, skipping replays so refreshes and bots don't add rows
+    scanned_by_ip = request.META.get('REMOTE_ADDR')
+    if cache.add(f'qr_scan:{vehicle.pk}:{scanned_by_ip}', True, SCAN_DEDUPE_SECONDS):
         QRCodeScan.objects.create(
-            vehicle=vehicle,
-            scanned_by_ip=request.META.get('REMOTE_ADDR'),
+            vehicle_id=vehicle.pk,
+            scanned_by_ip=scanned_by_ip,
             scanned_by_user_agent=request.META.get('HTTP_USER_AGENT', ''),
         )
-        
-        # Get contact information based on visibility settings
-        contact_info = vehicle.get_contact_info()
-        
-        # Get emergency numbers from settings
-        from django.conf import settings
-        emergency_numbers = getattr(settings, 'EMERGENCY_NUMBERS', {
-            'police': '100',
-            'ambulance': '102',
-            'fire': '101',
-            'women_helpline': '1091',
-            'child_helpline': '1098',
-            'roadside_assistance': '1033',
-        })
-        
-        context = {
-            'vehicle': vehicle,
-            'contact_info': contact_info,
-            'emergency_numbers': emergency_numbers,
-        }
-        return render(request, 'parking/scan_result.html', context)
-        
-    except Vehicle.DoesNotExist:
-        messages.error(request, 'Invalid or inactive QR code.')
-        return redirect('home')
+    
+    # Get contact information based on visibility settings
+    contact_info = vehicle.get_contact_info()
+    
+    # Get emergency numbers from settings
+    emergency_numbers = getattr(settings, 'EMERGENCY_NUMBERS', {
+        'police': '100',
+        'ambulance': '102',
+        'fire': '101',
+        'women_helpline': '1091',
+        'child_helpline': '1098',
+        'roadside_assistance': '1033',
+    })
+    
+    context = {
+        'vehicle': vehicle,
+        'contact_info': contact_info,
+        'emergency_numbers': emergency_numbers,
+    }
+    return render(request, 'parking/scan_result.html', context)
 
 
 @csrf_exempt
@@ -751,7 +904,7 @@ def contact_owner_api(request, qr_id):
     
     try:
         vehicle = Vehicle.objects.get(qr_unique_id=qr_id, is_qr_active=True)
-        data = json.loads(request.body)
+        data = json_body(request)
         
         reason = data.get('reason')
         message = data.get('message', '')
@@ -762,7 +915,7 @@ def contact_owner_api(request, qr_id):
         # 2. Log the contact request
         # 3. Handle SMS/call routing
         
-        return JsonResponse({
+        return json_response({
             'message': 'Contact request sent successfully',
             'vehicle_id': str(vehicle.qr_unique_id),
             'contact_method': contact_method
@@ -783,12 +936,17 @@ def search_vehicle(request):
         if form.is_valid():
             query = form.cleaned_data['search_query']
             
-            # Search by license plate or QR code
-            vehicles = Vehicle.objects.filter(
-                Q(license_plate__icontains=query) | 
-                Q(qr_unique_id__icontains=query),
-                is_qr_active=True
-            )
+            # Search by QR code id or license plate, both through btree indexes
+            qr_id = QR_ID_RE.search(query)
+            plate = normalize_plate(query)
+            if qr_id:
+                lookup = Q(qr_unique_id=qr_id.group())
+            elif len(plate) < PLATE_PREFIX_MIN_LENGTH:
+                # Too short to narrow a prefix scan, so only an exact plate is matched
+                lookup = Q(license_plate_norm=plate)
+            else:
+                lookup = Q(license_plate_norm__startswith=plate)
+            vehicles = Vehicle.objects.filter(lookup, is_qr_active=True)
             
             context = {
                 'form': form,
@@ -812,13 +970,8 @@ def get_masked_number_api(request, qr_id):
         return JsonResponse({'error': 'Method not allowed'}, status=405)
     
     try:
-        from .masking_service import MockMaskingService
-        from .models import PhoneNumberMasking
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        # Get the vehicle
-        vehicle = Vehicle.objects.get(qr_unique_id=qr_id, is_qr_active=True)
+        # Get the vehicle, joining the owner's plan and contact phone read below
+        vehicle = Vehicle.objects.select_related('user__current_plan', 'contact_phone').get(qr_unique_id=qr_id, is_qr_active=True)
         
         # Check if masking is enabled for this specific vehicle
         if not vehicle.masking_enabled:
@@ -836,7 +989,7 @@ def get_masked_number_api(request, qr_id):
             max_sessions = user_plan.max_masking_sessions
         
         active_sessions_count = PhoneNumberMasking.objects.filter(
-            vehicle__user=vehicle.user,
+            vehicle__user_id=vehicle.user_id,
             status='active',
             expires_at__gt=timezone.now()
         ).count()
@@ -868,7 +1021,7 @@ def get_masked_number_api(request, qr_id):
         if active_session:
             # Return existing masked number
             active_session.increment_call_count()
-            return JsonResponse({
+            return json_response({
                 'success': True,
                 'masked_number': active_session.masked_phone,
                 'original_number': original_phone,
@@ -890,7 +1043,7 @@ def get_masked_number_api(request, qr_id):
             call_count=1
         )
         
-        return JsonResponse({
+        return json_response({
             'success': True,
             'masked_number': masking_data['masked_number'],
             'original_number': original_phone,
@@ -913,30 +1066,28 @@ def terminate_masking_session_api(request, qr_id):
         return JsonResponse({'error': 'Method not allowed'}, status=405)
     
     try:
-        from .models import PhoneNumberMasking
-        from django.utils import timezone
-        
-        # Get the vehicle
-        vehicle = Vehicle.objects.get(qr_unique_id=qr_id, is_qr_active=True)
-        
         # Get session ID from request
-        data = json.loads(request.body)
+        data = json_body(request)
         session_id = data.get('session_id')
         
         if not session_id:
             return JsonResponse({'error': 'Session ID required'}, status=400)
         
-        # Find and terminate the session
-        masking_session = PhoneNumberMasking.objects.get(
-            vehicle=vehicle,
+        # Terminate the session in a single UPDATE, without loading the vehicle or session
+        terminated = PhoneNumberMasking.objects.filter(
+            vehicle__qr_unique_id=qr_id,
+            vehicle__is_qr_active=True,
             session_id=session_id,
-            status='active'
-        )
+            status=PhoneNumberMasking.Status.ACTIVE
+        ).update(status=PhoneNumberMasking.Status.CANCELLED)
         
-        masking_session.status = 'cancelled'
-        masking_session.save()
+        if not terminated:
+            # Only the failure path needs to tell a missing vehicle from a missing session
+            if not Vehicle.objects.filter(qr_unique_id=qr_id, is_qr_active=True).exists():
+                raise Vehicle.DoesNotExist
+            raise PhoneNumberMasking.DoesNotExist
         
-        return JsonResponse({
+        return json_response({
             'success': True,
             'message': 'Masking session terminated successfully',
             'session_id': str(session_id)
@@ -958,10 +1109,11 @@ def chatbot_api(request):
     if request.method != 'POST':
         return JsonResponse({'error': 'Method not allowed'}, status=405)
     
+    if Groq is None:
+        return JsonResponse({'error': 'Groq library not installed. Please install: pip install groq'}, status=500)
+    
     try:
-        from groq import Groq
-        
-        data = json.loads(request.body)
+        data = json_body(request)
         user_message = data.get('message', '').strip()
         
         if not user_message:
@@ -1028,13 +1180,11 @@ Be friendly, helpful, and provide accurate information about ParkPing features.
         
         bot_response = chat_completion.choices[0].message.content
         
-        return JsonResponse({
+        return json_response({
             'success': True,
             'response': bot_response
         })
         
-    except ImportError:
-        return JsonResponse({'error': 'Groq library not installed. Please install: pip install groq'}, status=500)
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
     except Exception as e:
@@ -1050,13 +1200,11 @@ def initiate_call(request, qr_id):
     if request.method != 'POST':
         return JsonResponse({'error': 'Method not allowed'}, status=405)
     
+    if CallService is None or not settings.CLICK_TO_CALL_AUTH_KEY:
+        return JsonResponse({'error': 'Calling is not available'}, status=503)
+    
     try:
-        from .call_service import CallService
-        from .models import PhoneNumberMasking
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        data = json.loads(request.body)
+        data = json_body(request)
         scanner_number = data.get('phone_number', '').strip()
         owner_phone = data.get('owner_phone', '').strip()  # Get selected owner phone
         
@@ -1067,8 +1215,8 @@ def initiate_call(request, qr_id):
         if not CallService.validate_phone_number(scanner_number):
             return JsonResponse({'error': 'Invalid phone number format'}, status=400)
         
-        # Get the vehicle
-        vehicle = Vehicle.objects.get(qr_unique_id=qr_id, is_qr_active=True)
+        # Get the vehicle, joining the owner's plan and contact phone read below
+        vehicle = Vehicle.objects.select_related('user__current_plan', 'contact_phone').get(qr_unique_id=qr_id, is_qr_active=True)
         
         user_plan = vehicle.user.current_plan
         max_sessions = 999  # Default unlimited for all plans
@@ -1077,7 +1225,7 @@ def initiate_call(request, qr_id):
             max_sessions = user_plan.max_masking_sessions
         
         active_sessions_count = PhoneNumberMasking.objects.filter(
-            vehicle__user=vehicle.user,
+            vehicle__user_id=vehicle.user_id,
             status='active',
             expires_at__gt=timezone.now()
         ).count()
@@ -1121,6 +1269,8 @@ def initiate_call(request, qr_id):
                 'expires_at': timezone.now() + timedelta(minutes=30),
                 'call_count': 0,
                 'status': 'active',
+                'call_status': PhoneNumberMasking.CallStatus.QUEUED,
+                'call_queued_at': timezone.now(),
             }
         )
         
@@ -1128,31 +1278,30 @@ def initiate_call(request, qr_id):
             masking_session.scanner_phone = scanner_number
             masking_session.status = 'active'
             masking_session.expires_at = timezone.now() + timedelta(minutes=30)
-            masking_session.save()
+            masking_session.call_status = PhoneNumberMasking.CallStatus.QUEUED
+            masking_session.call_error = ''
+            masking_session.call_queued_at = timezone.now()
+            masking_session.save(update_fields=[
+                'scanner_phone', 'status', 'expires_at', 'call_status', 'call_error', 'call_queued_at'
+            ])
         
-        # Initiate Call
-        call_result = CallService.connect_call(
+        # Queue the call; the worker records the outcome on the session for call_status_api
+        if CallService.dispatch_call(
+            masking_session.pk,
             owner_number=owner_number,
             scanner_number=scanner_number,
             qr_id=str(qr_id)
-        )
-        
-        if not call_result.get('success'):
-            return JsonResponse({
-                'error': call_result.get('error', 'Failed to initiate call'),
-                'details': call_result
-            }, status=500)
-        
-        # Update session with call SID if any
-        masking_session.twilio_call_sid = call_result.get('call_sid')
-        masking_session.increment_call_count()
-        masking_session.save()
+        ) is None:
+            PhoneNumberMasking.objects.filter(pk=masking_session.pk).update(
+                call_status=PhoneNumberMasking.CallStatus.FAILED,
+                call_error='Call queue full'
+            )
+            return JsonResponse({'error': 'Too many calls in progress. Please try again shortly.'}, status=503)
         
-        return JsonResponse({
+        return json_response({
             'success': True,
             'message': 'Call initiated. You will be connected shortly.',
-            'call_sid': call_result.get('call_sid'),
-            'status': call_result.get('status'),
+            'status': 'queued',
             'session_id': str(masking_session.session_id)
         })
         
@@ -1163,3 +1312,29 @@ def initiate_call(request, qr_id):
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+
+def call_status_api(request, qr_id, session_id):
+    """API endpoint for polling the outcome of a queued call"""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    sessions = PhoneNumberMasking.objects.filter(session_id=session_id, vehicle__qr_unique_id=qr_id)
+    masking_session = sessions.values('call_status', 'call_error', 'call_queued_at').first()
+    if masking_session is None:
+        return JsonResponse({'error': 'Session not found'}, status=404)
+    
+    # Queued calls live in a worker's memory, so one still queued this long was lost with its worker
+    queued_at = masking_session['call_queued_at']
+    if (masking_session['call_status'] == PhoneNumberMasking.CallStatus.QUEUED
+            and queued_at and queued_at < timezone.now() - timedelta(seconds=CALL_QUEUED_STALE_SECONDS)):
+        masking_session['call_status'] = PhoneNumberMasking.CallStatus.FAILED
+        masking_session['call_error'] = 'The call could not be placed. Please try again.'
+        sessions.filter(call_status=PhoneNumberMasking.CallStatus.QUEUED, call_queued_at=queued_at).update(
+            call_status=masking_session['call_status'],
+            call_error=masking_session['call_error']
+        )
+    
+    return json_response({
+        'status': masking_session['call_status'],
+        'error': masking_session['call_error'],
+    })